@@ -1,5 +1,6 @@
 """Session management for waveform files."""
 
+import threading
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
@@ -28,7 +29,11 @@ class WaveformSession:
     last_accessed: datetime
     multi_threaded: bool = True
     remove_scopes_with_empty_name: bool = False
+    # Bookmark dicts in creation order; saved and restored verbatim by
+    # session_save_state/session_load_state
     bookmarks: list = field(default_factory=list)
+    # Next bookmark id; only ever increases so removed ids are never reused
+    next_bookmark_id: int = 0
 
     @property
     def file_path(self) -> str:
@@ -55,6 +60,11 @@ class SessionManager:
         self.max_sessions = max_sessions
         self.session_timeout = session_timeout
         self._sessions: Dict[str, WaveformSession] = {}
+        # waveform_open creates sessions from worker threads while the event
+        # loop closes them; every mutation of _sessions holds this lock
+        self._lock = threading.RLock()
+        # Slots reserved by create_session calls still parsing their file
+        self._pending = 0
 
     def create_session(
         self,
@@ -79,48 +89,59 @@ class SessionManager:
         if Waveform is None:
             raise RuntimeError("pywellen not available")
 
-        # Clean up expired sessions if at capacity
-        if len(self._sessions) >= self.max_sessions:
-            self._cleanup_expired()
-
-        if len(self._sessions) >= self.max_sessions:
-            raise RuntimeError(
-                f"Maximum number of sessions ({self.max_sessions}) reached. "
-                "Close existing sessions or wait for timeout."
-            )
-
-        # Generate unique session ID
-        session_id = str(uuid.uuid4())
-
-        # Load waveform
         path = Path(filepath)
         if not path.exists():
             raise FileNotFoundError(f"Waveform file not found: {filepath}")
 
+        # Reserve a slot under the lock, but parse outside it so concurrent
+        # opens are not serialized behind each other
+        with self._lock:
+            # Clean up expired sessions if at capacity
+            if len(self._sessions) + self._pending >= self.max_sessions:
+                self._cleanup_expired()
+
+            if len(self._sessions) + self._pending >= self.max_sessions:
+                raise RuntimeError(
+                    f"Maximum number of sessions ({self.max_sessions}) reached. "
+                    "Close existing sessions or wait for timeout."
+                )
+            self._pending += 1
+
         try:
-            waveform = Waveform(
-                path=str(path),
+            # pywellen opens and parses the file natively from its path, so the
+            # file is never read into Python memory here.
+            try:
+                waveform = Waveform(
+                    path=str(path),
+                    multi_threaded=multi_threaded,
+                    remove_scopes_with_empty_name=remove_scopes_with_empty_name,
+                )
+            except Exception as e:
+                raise RuntimeError(f"Failed to load waveform: {e}")
+
+            # Create session
+            now = datetime.now()
+            session = WaveformSession(
+                session_id=str(uuid.uuid4()),
+                filepath=path,
+                waveform=waveform,
+                hierarchy=waveform.hierarchy,
+                time_table=waveform.time_table,
+                created_at=now,
+                last_accessed=now,
                 multi_threaded=multi_threaded,
                 remove_scopes_with_empty_name=remove_scopes_with_empty_name,
             )
-        except Exception as e:
-            raise RuntimeError(f"Failed to load waveform: {e}")
-
-        # Create session
-        now = datetime.now()
-        session = WaveformSession(
-            session_id=session_id,
-            filepath=path,
-            waveform=waveform,
-            hierarchy=waveform.hierarchy,
-            time_table=waveform.time_table,
-            created_at=now,
-            last_accessed=now,
-            multi_threaded=multi_threaded,
-            remove_scopes_with_empty_name=remove_scopes_with_empty_name,
-        )
-
-        self._sessions[session_id] = session
+        except BaseException:
+            # Release the reserved slot whatever failed
+            with self._lock:
+                self._pending -= 1
+            raise
+
+        # Swap the reservation for the session in one step
+        with self._lock:
+            self._pending -= 1
+            self._sessions[session.session_id] = session
         return session
 
     def get_session(self, session_id: str) -> Optional[WaveformSession]:
@@ -148,14 +169,13 @@ class SessionManager:
         Returns:
             True if session was closed, False if not found
         """
-        if session_id in self._sessions:
-            del self._sessions[session_id]
-            return True
-        return False
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
 
     def list_sessions(self) -> list[str]:
         """Get list of active session IDs."""
-        return list(self._sessions.keys())
+        with self._lock:
+            return list(self._sessions.keys())
 
     def get_session_count(self) -> int:
         """Get number of active sessions."""
@@ -168,12 +188,13 @@ class SessionManager:
         Returns:
             Number of sessions removed
         """
-        expired = [
-            sid for sid, session in self._sessions.items() if session.is_expired(self.session_timeout)
-        ]
-        for sid in expired:
-            del self._sessions[sid]
-        return len(expired)
+        with self._lock:
+            expired = [
+                sid for sid, session in self._sessions.items() if session.is_expired(self.session_timeout)
+            ]
+            for sid in expired:
+                del self._sessions[sid]
+            return len(expired)
 
     def cleanup_all(self) -> int:
         """
@@ -182,6 +203,7 @@ class SessionManager:
         Returns:
             Number of sessions closed
         """
-        count = len(self._sessions)
-        self._sessions.clear()
-        return count
+        with self._lock:
+            count = len(self._sessions)
+            self._sessions.clear()
+            return count
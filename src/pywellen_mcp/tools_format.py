@@ -9,6 +9,13 @@ debugging and analysis workflows.
 from typing import Literal, Dict, Any, Optional
 
 
+def _twos_complement(unsigned_value: int, bitwidth: int) -> int:
+    """Interpret an unsigned integer of the given bit width as two's complement."""
+    if unsigned_value & (1 << (bitwidth - 1)):
+        return unsigned_value - (1 << bitwidth)
+    return unsigned_value
+
+
 async def format_value(
     value: str,
     from_format: Literal["auto", "binary", "hex", "decimal", "octal"] = "auto",
@@ -177,15 +184,8 @@ async def format_as_signed(
         raise ValueError(f"Value {unsigned_value} exceeds bitwidth {bitwidth}")
     
     # Convert to signed using two's complement
-    sign_bit = 1 << (bitwidth - 1)
-    if unsigned_value & sign_bit:
-        # Negative number
-        signed_value = unsigned_value - (1 << bitwidth)
-        is_negative = True
-    else:
-        # Positive number
-        signed_value = unsigned_value
-        is_negative = False
+    signed_value = _twos_complement(unsigned_value, bitwidth)
+    is_negative = signed_value < 0
     
     # Format outputs
     hex_str = f"0x{unsigned_value:0{(bitwidth + 3) // 4}x}"
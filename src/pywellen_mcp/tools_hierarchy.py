@@ -1,5 +1,6 @@
 """Hierarchy navigation tools for exploring waveform structure."""
 
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Pattern
 import re
 
@@ -7,6 +8,25 @@ from .session import SessionManager
 from .errors import SessionError, QueryError, ErrorCode
 
 
+@lru_cache(maxsize=256)
+def _compile_pattern(pattern: str, case_sensitive: bool, regex: bool) -> Pattern:
+    """
+    Compile a hierarchy search pattern, caching the result.
+
+    Invalid regexes raise ``re.error`` and are not cached.
+
+    Args:
+        pattern: Search pattern (regex or literal string)
+        case_sensitive: Case-sensitive matching
+        regex: Treat pattern as regex (otherwise substring match)
+
+    Returns:
+        Compiled pattern
+    """
+    flags = 0 if case_sensitive else re.IGNORECASE
+    return re.compile(pattern if regex else re.escape(pattern), flags)
+
+
 class HierarchyTools:
     """Tools for navigating waveform hierarchy."""
 
@@ -300,16 +320,9 @@ class HierarchyTools:
 
         hierarchy = session.hierarchy
 
-        # Compile pattern
+        # Compile pattern (substring searches are escaped)
         try:
-            if regex:
-                flags = 0 if case_sensitive else re.IGNORECASE
-                compiled_pattern = re.compile(pattern, flags)
-            else:
-                # Substring search - escape pattern and make it case-insensitive if needed
-                escaped = re.escape(pattern)
-                flags = 0 if case_sensitive else re.IGNORECASE
-                compiled_pattern = re.compile(escaped, flags)
+            compiled_pattern = _compile_pattern(pattern, case_sensitive, regex)
         except re.error as e:
             raise QueryError(
                 f"Invalid regex pattern: {e}",
@@ -402,7 +415,10 @@ class HierarchyTools:
 
     def _iter_all_scopes(self, hierarchy):
         """
-        Recursively iterate over all scopes in hierarchy.
+        Iterate over all scopes in hierarchy in depth-first pre-order.
+
+        Uses an explicit stack rather than nested generators, so deep
+        hierarchies do not pay per-level ``yield from`` overhead.
 
         Args:
             hierarchy: Hierarchy object
@@ -410,10 +426,11 @@ class HierarchyTools:
         Yields:
             Scope objects
         """
-        def recurse(scope):
+        stack = list(hierarchy.top_scopes())
+        stack.reverse()
+        while stack:
+            scope = stack.pop()
             yield scope
-            for child in scope.scopes(hierarchy):
-                yield from recurse(child)
-
-        for top in hierarchy.top_scopes():
-            yield from recurse(top)
+            children = list(scope.scopes(hierarchy))
+            children.reverse()
+            stack.extend(children)
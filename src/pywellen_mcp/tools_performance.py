@@ -264,11 +264,7 @@ async def perf_cache_stats(
     cache = signal_tools.signal_cache
     
     # Get cached signals for this session
-    cached_signals = []
-    for key in cache._cache.keys():
-        sid, path = key
-        if sid == session_id:
-            cached_signals.append(path)
+    cached_signals = cache.cached_paths(session_id)
     
     cache_size = len(cached_signals)
     
@@ -5,12 +5,145 @@ This module provides tools for saving/loading session state and managing
 bookmarks for long debugging sessions.
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, cast
+import asyncio
 import json
+import os
+import sys
+import tempfile
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+try:
+    import ujson
+    UJSON_AVAILABLE = True
+except ImportError:
+    UJSON_AVAILABLE = False
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
 from pathlib import Path
 from datetime import datetime
 from .session import SessionManager
-from .errors import SessionError, FileError
+from .errors import SessionError, FileError, ErrorCode
+
+MSGPACK_SUFFIX = ".msgpack"
+ZSTD_SUFFIX = ".zst"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Process umask, read once at import: os.umask can only be queried by
+# setting it, which is not safe from the worker threads that save state
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _dumps(state: Dict[str, Any]) -> bytes:
+    """Serialize state to indented JSON bytes, preferring orjson, then ujson."""
+    if ORJSON_AVAILABLE:
+        return cast(bytes, orjson.dumps(state, option=orjson.OPT_INDENT_2))
+    if UJSON_AVAILABLE:
+        text = cast(str, ujson.dumps(state, indent=2, escape_forward_slashes=False))
+        return text.encode("utf-8")
+    return json.dumps(state, indent=2).encode("utf-8")
+
+
+def _loads(data: bytes) -> Dict[str, Any]:
+    """Parse JSON bytes, preferring orjson, then ujson."""
+    if ORJSON_AVAILABLE:
+        return cast(Dict[str, Any], orjson.loads(data))
+    if UJSON_AVAILABLE:
+        return cast(Dict[str, Any], ujson.loads(data))
+    return cast(Dict[str, Any], json.loads(data))
+
+
+def _require(available: bool, feature: str, package: str, path: Path) -> None:
+    if not available:
+        raise FileError(
+            f"{feature} session state requires '{package}' package",
+            code=ErrorCode.FILE_FORMAT_UNSUPPORTED,
+            context={"path": str(path)},
+        )
+
+
+def _encode_state(state: Dict[str, Any], path: Path) -> bytes:
+    """Encode state by suffix: .zst compresses, .msgpack is MessagePack, else JSON."""
+    if path.suffix == ZSTD_SUFFIX:
+        _require(ZSTD_AVAILABLE, "Compressed", "zstandard", path)
+        data = _encode_state(state, path.with_suffix(""))
+        return cast(bytes, zstandard.ZstdCompressor(level=3).compress(data))
+    if path.suffix == MSGPACK_SUFFIX:
+        _require(MSGSPEC_AVAILABLE, "MessagePack", "msgspec", path)
+        return cast(bytes, msgspec.msgpack.encode(state))
+    return _dumps(state)
+
+
+def _is_msgpack_map(data: bytes) -> bool:
+    """Check for a leading MessagePack map marker (fixmap, map16 or map32)."""
+    return bool(data) and (0x80 <= data[0] <= 0x8f or data[0] in (0xde, 0xdf))
+
+
+def _decode_state(data: bytes, path: Path) -> Dict[str, Any]:
+    """Decode a state file, sniffing zstd by its magic and MessagePack by suffix or map marker."""
+    if data[:4] == ZSTD_MAGIC:
+        _require(ZSTD_AVAILABLE, "Compressed", "zstandard", path)
+        inner = path.with_suffix("") if path.suffix == ZSTD_SUFFIX else path
+        return _decode_state(zstandard.ZstdDecompressor().decompress(data), inner)
+    if path.suffix == MSGPACK_SUFFIX or _is_msgpack_map(data):
+        _require(MSGSPEC_AVAILABLE, "MessagePack", "msgspec", path)
+        state = msgspec.msgpack.decode(data)
+    else:
+        state = _loads(data)
+    if not isinstance(state, dict):
+        raise FileError(
+            f"Session state must be a mapping, got {type(state).__name__}",
+            code=ErrorCode.FILE_CORRUPTED,
+            context={"path": str(path)},
+        )
+    return state
+
+
+def _save_sync(path: Path, state: Dict[str, Any]) -> int:
+    """Encode and write state, returning the number of bytes written.
+
+    The state is written and fsynced to a unique sibling temporary file,
+    then renamed over the target, so an interrupted save never leaves a
+    truncated checkpoint and concurrent saves never share a temp file.
+    """
+    data = _encode_state(state, path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            # mkstemp creates the file 0600; keep the mode a plain open()
+            # would give, or the existing checkpoint's mode when overwriting
+            try:
+                mode = os.stat(path).st_mode & 0o7777
+            except FileNotFoundError:
+                mode = 0o666 & ~_UMASK
+            os.fchmod(f.fileno(), mode)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return len(data)
+
+
+def _load_sync(path: Path) -> Dict[str, Any]:
+    """Read and decode a state file."""
+    with open(path, 'rb') as f:
+        return _decode_state(f.read(), path)
 
 
 async def session_save_state(
@@ -31,7 +164,9 @@ async def session_save_state(
     Args:
         session_manager: Session management instance
         session_id: Active waveform session to save
-        save_path: Optional path to save state (default: session_<id>.json)
+        save_path: Optional path to save state (default: session_<id>.json);
+            a .msgpack suffix stores MessagePack instead of JSON, and a
+            trailing .zst compresses either with zstd
         include_bookmarks: Include bookmarks in saved state
         include_cache: Include cached signal list (not signal data)
         
@@ -55,7 +190,9 @@ async def session_save_state(
             "multi_threaded": session.multi_threaded,
             "remove_empty_scopes": session.remove_empty_scopes,
         },
-        "bookmarks": session.bookmarks if include_bookmarks else [],
+        # Snapshot: the list is written from a worker thread while bookmark
+        # tools keep mutating session.bookmarks on the event loop
+        "bookmarks": list(session.bookmarks) if include_bookmarks else [],
     }
     
     if include_cache:
@@ -68,16 +205,17 @@ async def session_save_state(
     
     save_path = Path(save_path)
     
-    # Write to file
+    # Write to file off the event loop
     try:
-        save_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(save_path, 'w') as f:
-            json.dump(state, f, indent=2)
+        state_size = await asyncio.to_thread(_save_sync, save_path, state)
+    except FileError:
+        raise
     except Exception as e:
-        raise FileError(f"Failed to save session state: {e}", {"path": str(save_path)})
-    
-    # Get file size
-    state_size = save_path.stat().st_size
+        raise FileError(
+            f"Failed to save session state: {e}",
+            code=ErrorCode.INTERNAL_ERROR,
+            context={"path": str(save_path)},
+        )
     
     return {
         "save_path": str(save_path),
@@ -114,12 +252,17 @@ async def session_load_state(
     """
     load_path = Path(load_path)
     
-    # Read state file
+    # Read state file off the event loop
     try:
-        with open(load_path, 'r') as f:
-            state = json.load(f)
+        state = await asyncio.to_thread(_load_sync, load_path)
+    except FileError:
+        raise
     except Exception as e:
-        raise FileError(f"Failed to load session state: {e}", {"path": str(load_path)})
+        raise FileError(
+            f"Failed to load session state: {e}",
+            code=ErrorCode.INTERNAL_ERROR,
+            context={"path": str(load_path)},
+        )
     
     # Validate state version
     if state.get("version") != "1.0":
@@ -145,6 +288,9 @@ async def session_load_state(
     if restore_bookmarks and "bookmarks" in state:
         session = session_manager.get_session(new_session_id)
         session.bookmarks = state["bookmarks"]
+        session.next_bookmark_id = max(
+            (bookmark["id"] for bookmark in session.bookmarks), default=-1
+        ) + 1
         bookmarks_restored = len(state["bookmarks"])
     
     return {
@@ -168,7 +314,8 @@ async def session_add_bookmark(
     Add a bookmark to mark an interesting time point.
     
     Bookmarks help organize investigation by marking important events,
-    transitions, or areas of interest.
+    transitions, or areas of interest. They are kept in memory on the
+    session and only written to disk by session_save_state.
     
     Args:
         session_manager: Session management instance
@@ -188,17 +335,19 @@ async def session_add_bookmark(
     """
     session = session_manager.get_session(session_id)
     
-    # Create bookmark
+    # Create bookmark; labels and signal paths repeat across bookmarks,
+    # so intern them to share one string object per distinct value
     bookmark = {
-        "id": len(session.bookmarks),
+        "id": session.next_bookmark_id,
         "time": time,
-        "label": label,
+        "label": sys.intern(label),
         "notes": notes,
-        "signals": signals or [],
+        "signals": [sys.intern(path) for path in signals] if signals else [],
         "created_at": datetime.now().isoformat(),
     }
     
     session.bookmarks.append(bookmark)
+    session.next_bookmark_id += 1
     
     return {
         "bookmark_id": bookmark["id"],
@@ -264,11 +413,14 @@ async def session_remove_bookmark(
     """
     session = session_manager.get_session(session_id)
     
-    # Find and remove bookmark
-    original_len = len(session.bookmarks)
-    session.bookmarks = [b for b in session.bookmarks if b["id"] != bookmark_id]
-    
-    removed = len(session.bookmarks) < original_len
+    # Find and remove bookmark in place; ids are unique, so stop at the first match
+    bookmarks = session.bookmarks
+    removed = False
+    for idx, bookmark in enumerate(bookmarks):
+        if bookmark["id"] == bookmark_id:
+            del bookmarks[idx]
+            removed = True
+            break
     
     return {
         "success": removed,
@@ -1,58 +1,111 @@
 """Signal data access tools for querying waveform values."""
 
+from bisect import bisect_left
 from typing import Any, Dict, List, Optional, Union
-from collections import OrderedDict
+from collections import Counter, OrderedDict
 
 from .session import SessionManager
 from .errors import SessionError, QueryError, ErrorCode
 
 
+def _time_points(time_table) -> List[int]:
+    """Read every time point from a time table, in index order."""
+    time_points = []
+    idx = 0
+    try:
+        while True:
+            time_points.append(time_table[idx])
+            idx += 1
+    except (IndexError, Exception):
+        # Reached end
+        pass
+    return time_points
+
+
 class SignalCache:
-    """LRU cache for signal data."""
+    """LRU cache for signal data, grouped by session."""
 
     def __init__(self, max_size: int = 100):
         self.max_size = max_size
-        self._cache: OrderedDict[tuple, Any] = OrderedDict()
+        # Global recency order used for eviction
+        self._lru: OrderedDict[tuple, None] = OrderedDict()
+        # Per-session signals, so a session can be dropped without a scan
+        self._by_session: Dict[str, OrderedDict[str, Any]] = {}
 
     def get(self, session_id: str, var_path: str) -> Optional[Any]:
         """Get cached signal."""
-        key = (session_id, var_path)
-        if key in self._cache:
-            # Move to end (most recently used)
-            self._cache.move_to_end(key)
-            return self._cache[key]
-        return None
+        entries = self._by_session.get(session_id)
+        if entries is None or var_path not in entries:
+            return None
+        
+        # Move to end (most recently used)
+        self._lru.move_to_end((session_id, var_path))
+        entries.move_to_end(var_path)
+        return entries[var_path]
 
     def put(self, session_id: str, var_path: str, signal: Any) -> None:
         """Cache signal with LRU eviction."""
-        key = (session_id, var_path)
+        entries = self._by_session.get(session_id)
         
         # If already exists, update and move to end
-        if key in self._cache:
-            self._cache.move_to_end(key)
-            self._cache[key] = signal
+        if entries is not None and var_path in entries:
+            self._lru.move_to_end((session_id, var_path))
+            entries.move_to_end(var_path)
+            entries[var_path] = signal
             return
         
         # If at capacity, remove oldest
-        if len(self._cache) >= self.max_size:
-            self._cache.popitem(last=False)
+        if len(self._lru) >= self.max_size:
+            self._evict_oldest()
         
-        self._cache[key] = signal
+        self._by_session.setdefault(session_id, OrderedDict())[var_path] = signal
+        self._lru[(session_id, var_path)] = None
+
+    def bulk_put(self, session_id: str, items: Dict[str, Any]) -> None:
+        """Cache several signals for a session, evicting oldest entries once."""
+        entries = self._by_session.setdefault(session_id, OrderedDict())
+        lru = self._lru
+        for var_path, signal in items.items():
+            key = (session_id, var_path)
+            if key in lru:
+                lru.move_to_end(key)
+                entries.move_to_end(var_path)
+            else:
+                lru[key] = None
+            entries[var_path] = signal
+        
+        while len(lru) > self.max_size:
+            self._evict_oldest()
+
+    def _evict_oldest(self) -> None:
+        """Drop the least recently used signal."""
+        (session_id, var_path), _ = self._lru.popitem(last=False)
+        entries = self._by_session[session_id]
+        del entries[var_path]
+        if not entries:
+            del self._by_session[session_id]
 
     def clear_session(self, session_id: str) -> int:
         """Clear all cached signals for a session."""
-        to_remove = [key for key in self._cache if key[0] == session_id]
-        for key in to_remove:
-            del self._cache[key]
-        return len(to_remove)
+        entries = self._by_session.pop(session_id, None)
+        if not entries:
+            return 0
+        for var_path in entries:
+            del self._lru[(session_id, var_path)]
+        return len(entries)
+
+    def cached_paths(self, session_id: str) -> List[str]:
+        """Get cached variable paths for a session, least recently used first."""
+        return list(self._by_session.get(session_id, ()))
 
     def clear(self) -> None:
         """Clear entire cache."""
-        self._cache.clear()
+        self._lru.clear()
+        self._by_session.clear()
 
     def size(self) -> int:
         """Get current cache size."""
-        return len(self._cache)
+        return len(self._lru)
 
 
 class SignalTools:
@@ -95,16 +148,20 @@ class SignalTools:
         # Get or cache signal
         signal = self._get_signal(session, variable_path)
 
-        # Query values
+        # Query values, looking up each distinct time only once
+        by_time: Dict[int, Dict[str, Any]] = {}
         values = []
         for time in time_list:
-            try:
-                value = signal.value_at_time(time)
-                formatted_value = self._format_value(value, format)
-                values.append({"time": time, "value": formatted_value})
-            except Exception as e:
-                # Signal may not have value at this time
-                values.append({"time": time, "value": None, "error": str(e)})
+            entry = by_time.get(time)
+            if entry is None:
+                try:
+                    value = signal.value_at_time(time)
+                    entry = {"time": time, "value": self._format_value(value, format)}
+                except Exception as e:
+                    # Signal may not have value at this time
+                    entry = {"time": time, "value": None, "error": str(e)}
+                by_time[time] = entry
+            values.append(entry)
 
         return {
             "session_id": session_id,
@@ -221,28 +278,16 @@ class SignalTools:
                 context={"session_id": session_id},
             )
 
+        # Single scan keeping only the first and last time points
         time_table = session.time_table
-
-        # Find time range by probing time_table
-        try:
-            min_time = time_table[0]
-        except (IndexError, Exception):
-            # Empty time table
-            return {
-                "session_id": session_id,
-                "min_time": None,
-                "max_time": None,
-                "num_time_points": 0,
-            }
-
-        # Find max by iterating until we hit an error
-        max_idx = 0
-        max_time = min_time
+        min_time = max_time = None
+        num_time_points = 0
         try:
             while True:
-                time = time_table[max_idx]
-                max_time = time
-                max_idx += 1
+                max_time = time_table[num_time_points]
+                if num_time_points == 0:
+                    min_time = max_time
+                num_time_points += 1
         except (IndexError, Exception):
             # Reached end
             pass
@@ -251,7 +296,7 @@ class SignalTools:
             "session_id": session_id,
             "min_time": min_time,
             "max_time": max_time,
-            "num_time_points": max_idx,
+            "num_time_points": num_time_points,
         }
 
     async def time_convert(
@@ -302,52 +347,38 @@ class SignalTools:
 
         # Convert times to nearest indices
         if times is not None:
-            # Build time->index mapping by scanning time table
-            time_to_index_map = {}
-            idx = 0
-            try:
-                while True:
-                    time = time_table[idx]
-                    time_to_index_map[time] = idx
-                    idx += 1
-            except (IndexError, Exception):
-                pass
+            time_points = _time_points(time_table)
 
             time_to_index = []
             for query_time in times:
-                # Find exact match or closest time
-                if query_time in time_to_index_map:
+                if not time_points:
+                    time_to_index.append({
+                        "time": query_time,
+                        "index": None,
+                        "error": "No time points available",
+                    })
+                    continue
+
+                # Binary search; ties resolve to the earlier time point
+                idx = bisect_left(time_points, query_time)
+                if idx < len(time_points) and time_points[idx] == query_time:
                     time_to_index.append({
                         "time": query_time,
-                        "index": time_to_index_map[query_time],
+                        "index": idx,
                         "exact": True,
                     })
-                else:
-                    # Find nearest time
-                    nearest_time = None
-                    nearest_idx = None
-                    min_diff = float('inf')
-                    
-                    for time, idx in time_to_index_map.items():
-                        diff = abs(time - query_time)
-                        if diff < min_diff:
-                            min_diff = diff
-                            nearest_time = time
-                            nearest_idx = idx
-                    
-                    if nearest_time is not None:
-                        time_to_index.append({
-                            "time": query_time,
-                            "index": nearest_idx,
-                            "exact": False,
-                            "nearest_time": nearest_time,
-                        })
-                    else:
-                        time_to_index.append({
-                            "time": query_time,
-                            "index": None,
-                            "error": "No time points available",
-                        })
+                    continue
+
+                if idx == len(time_points) or (
+                    idx > 0 and query_time - time_points[idx - 1] <= time_points[idx] - query_time
+                ):
+                    idx -= 1
+                time_to_index.append({
+                    "time": query_time,
+                    "index": idx,
+                    "exact": False,
+                    "nearest_time": time_points[idx],
+                })
             
             result["time_to_index"] = time_to_index
 
@@ -404,14 +435,14 @@ class SignalTools:
         first_change_time = changes[0]["time"]
         last_change_time = changes[-1]["time"]
 
-        # Count unique values
-        unique_values = set(c["value"] for c in changes if c["value"] is not None)
+        # Count occurrences of each distinct value so parsing happens once per value
+        value_counts = Counter(c["value"] for c in changes if c["value"] is not None)
 
         stats = {
             "session_id": session_id,
             "variable_path": variable_path,
             "num_changes": num_changes,
-            "num_unique_values": len(unique_values),
+            "num_unique_values": len(value_counts),
             "first_change_time": first_change_time,
             "last_change_time": last_change_time,
             "time_range": {
@@ -422,27 +453,34 @@ class SignalTools:
 
         # Try to compute numeric statistics if values are numeric
         try:
-            numeric_values = []
-            for change in changes:
-                val = change["value"]
-                if val is not None and val != "x" and val != "z":
-                    # Try to parse as integer
-                    if isinstance(val, int):
-                        numeric_values.append(val)
-                    elif isinstance(val, str):
-                        # Try binary, hex, or decimal
-                        if val.startswith("0x") or val.startswith("0X"):
-                            numeric_values.append(int(val, 16))
-                        elif val.startswith("0b") or val.startswith("0B"):
-                            numeric_values.append(int(val, 2))
-                        elif val.isdigit():
-                            numeric_values.append(int(val))
-
-            if numeric_values:
+            min_value = max_value = None
+            num_numeric = 0
+            for val, count in value_counts.items():
+                if val == "x" or val == "z":
+                    continue
+                # Try binary, hex, or decimal
+                if isinstance(val, int):
+                    num = val
+                elif isinstance(val, str) and val[:2] in ("0x", "0X"):
+                    num = int(val, 16)
+                elif isinstance(val, str) and val[:2] in ("0b", "0B"):
+                    num = int(val, 2)
+                elif isinstance(val, str) and val.isdigit():
+                    num = int(val)
+                else:
+                    continue
+
+                num_numeric += count
+                if min_value is None or num < min_value:
+                    min_value = num
+                if max_value is None or num > max_value:
+                    max_value = num
+
+            if num_numeric:
                 stats["numeric_statistics"] = {
-                    "min_value": min(numeric_values),
-                    "max_value": max(numeric_values),
-                    "num_numeric_samples": len(numeric_values),
+                    "min_value": min_value,
+                    "max_value": max_value,
+                    "num_numeric_samples": num_numeric,
                 }
         except Exception:
             # Not numeric, skip numeric stats
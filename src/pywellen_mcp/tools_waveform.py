@@ -1,5 +1,8 @@
 """Waveform management tools - open, close, query metadata."""
 
+import asyncio
+import os
+import stat
 from typing import Any, Dict, Optional
 from pathlib import Path
 
@@ -31,24 +34,27 @@ class WaveformTools:
             Dictionary with session_id and file metadata
         """
         try:
-            # Validate path
+            # Validate path with a single stat call
             filepath = Path(path)
-            if not filepath.exists():
+            try:
+                st = os.stat(filepath)
+            except (FileNotFoundError, NotADirectoryError):
                 raise FileError(
                     f"File not found: {path}",
                     code=ErrorCode.FILE_NOT_FOUND,
                     context={"path": path},
                 )
 
-            if not filepath.is_file():
+            if not stat.S_ISREG(st.st_mode):
                 raise FileError(
                     f"Path is not a file: {path}",
                     code=ErrorCode.INVALID_PARAMETER,
                     context={"path": path},
                 )
 
-            # Create session
-            session = self.session_manager.create_session(
+            # Create session; parsing is blocking, so keep it off the event loop
+            session = await asyncio.to_thread(
+                self.session_manager.create_session,
                 filepath=str(filepath),
                 multi_threaded=multi_threaded,
                 remove_scopes_with_empty_name=remove_empty_scopes,
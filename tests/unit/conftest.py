@@ -1,8 +1,29 @@
 """Test configuration and fixtures."""
 
 import pytest
+from unittest.mock import Mock
+
+from pywellen_mcp.session import SessionManager
 
 
 def pytest_configure(config):
     """Configure pytest."""
     config.addinivalue_line("markers", "asyncio: mark test as async")
+
+
+@pytest.fixture(scope="session")
+def shared_vcd(tmp_path_factory):
+    """Dummy waveform file shared by tests that never read its contents."""
+    path = tmp_path_factory.mktemp("wf") / "test.vcd"
+    path.write_text("# dummy vcd content")
+    return path
+
+
+# Spec attribute list computed once; each test still gets its own Mock
+_SESSION_MANAGER_SPEC = dir(SessionManager)
+
+
+@pytest.fixture
+def spec_session_manager():
+    """Fresh SessionManager mock restricted to SessionManager's attributes."""
+    return Mock(spec=_SESSION_MANAGER_SPEC)
@@ -1,5 +1,6 @@
 """Unit tests for session management."""
 
+import threading
 import pytest
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -34,12 +35,10 @@ def session_manager():
     return SessionManager(max_sessions=3, session_timeout=timedelta(seconds=10))
 
 
-@pytest.fixture
-def temp_file(tmp_path):
-    """Create a temporary test file."""
-    test_file = tmp_path / "test.vcd"
-    test_file.write_text("# dummy vcd content")
-    return test_file
+@pytest.fixture(scope="module")
+def temp_file(shared_vcd):
+    """Dummy waveform file; contents are never read by MockWaveform."""
+    return shared_vcd
 
 
 class TestSessionManager:
@@ -63,6 +62,53 @@ class TestSessionManager:
         with pytest.raises(FileNotFoundError):
             session_manager.create_session("/nonexistent/file.vcd")
 
+    def test_create_session_parses_outside_lock(self, temp_file):
+        """Test parsing releases the lock but keeps the reserved slot counted."""
+        manager = SessionManager(max_sessions=1)
+        seen = {}
+
+        def probe():
+            if manager._lock.acquire(timeout=1):
+                seen["lock_free"] = True
+                manager._lock.release()
+
+        def parse(path, **kwargs):
+            thread = threading.Thread(target=probe)
+            thread.start()
+            thread.join()
+            with pytest.raises(RuntimeError, match="Maximum number of sessions"):
+                manager.create_session(str(temp_file))
+            return MockWaveform(path, **kwargs)
+
+        with patch("pywellen_mcp.session.Waveform", parse):
+            manager.create_session(str(temp_file))
+
+        assert seen == {"lock_free": True}
+        assert manager.get_session_count() == 1
+        assert manager._pending == 0
+
+    def test_create_session_failure_releases_slot(self, temp_file):
+        """Test a failure after parsing does not leak the reserved slot."""
+        manager = SessionManager(max_sessions=1)
+
+        class BrokenWaveform(MockWaveform):
+            @property
+            def time_table(self):
+                raise ValueError("no time table")
+
+            @time_table.setter
+            def time_table(self, value):
+                pass
+
+        with patch("pywellen_mcp.session.Waveform", BrokenWaveform):
+            with pytest.raises(ValueError):
+                manager.create_session(str(temp_file))
+
+        assert manager._pending == 0
+        with patch("pywellen_mcp.session.Waveform", MockWaveform):
+            manager.create_session(str(temp_file))
+        assert manager.get_session_count() == 1
+
     def test_create_session_max_sessions(self, session_manager, temp_file, mock_waveform):
         """Test session limit enforcement."""
         # Create max sessions
@@ -202,7 +202,7 @@ class TestDebugFindTransition:
         )
         
         assert result["count"] >= 1
-        assert all(int(t["value"]) > 5 for t in result["transitions"])
+        assert min(int(t["value"]) for t in result["transitions"]) > 5
     
     async def test_time_window(self, session_manager):
         """Test filtering by time window."""
@@ -1,10 +1,9 @@
 """Unit tests for export tools."""
 
 import pytest
-import os
 import json
-import csv
 import tempfile
+from types import SimpleNamespace
 from unittest.mock import Mock, patch, MagicMock
 from src.pywellen_mcp.tools_export import (
     export_to_csv,
@@ -17,6 +16,54 @@ from src.pywellen_mcp.session import SessionManager
 from src.pywellen_mcp.errors import FileError, QueryError
 
 
+# Opaque variable handles; the exporters only pass these back to the waveform.
+# Lookups are dict-backed (name -> handle) so they do not depend on call order.
+SENTINEL_VAR = object()
+SENTINEL_VAR_1 = object()
+SENTINEL_VAR_2 = object()
+
+# Expected exporter output for the deterministic JSON export cases
+EXPECTED_HIERARCHY_JSON = (
+    b'{\n'
+    b'  "design": "test.vcd",\n'
+    b'  "scopes": [\n'
+    b'    {\n'
+    b'      "name": "top",\n'
+    b'      "type": "Module",\n'
+    b'      "metadata": {\n'
+    b'        "num_children": 0,\n'
+    b'        "num_variables": 0,\n'
+    b'        "depth": 0\n'
+    b'      }\n'
+    b'    }\n'
+    b'  ]\n'
+    b'}'
+)
+
+EXPECTED_SIGNAL_JSON = (
+    b'{\n'
+    b'  "signal": "top.clk",\n'
+    b'  "changes": [\n'
+    b'    {\n'
+    b'      "time": 0,\n'
+    b'      "value": "0"\n'
+    b'    },\n'
+    b'    {\n'
+    b'      "time": 10,\n'
+    b'      "value": "1"\n'
+    b'    }\n'
+    b'  ],\n'
+    b'  "metadata": {\n'
+    b'    "total_changes": 2,\n'
+    b'    "time_range": {\n'
+    b'      "start": 0,\n'
+    b'      "end": 10\n'
+    b'    }\n'
+    b'  }\n'
+    b'}'
+)
+
+
 @pytest.fixture
 def mock_session_manager():
     """Create a mock session manager."""
@@ -31,6 +78,25 @@ def mock_session_manager():
     return manager, session
 
 
+@pytest.fixture(scope="session")
+def base_top_scope():
+    """Read-only top-level scope with no children or variables."""
+    return SimpleNamespace(
+        name="top",
+        scope_type="Module",
+        children=lambda: [],
+        variables=lambda: [],
+    )
+
+
+@pytest.fixture
+def top_scope_factory(base_top_scope):
+    """Build a shallow copy of the base top scope with selected fields overridden."""
+    def factory(**overrides):
+        return SimpleNamespace(**{**vars(base_top_scope), **overrides})
+    return factory
+
+
 class TestExportToCSV:
     """Tests for export_to_csv tool."""
     
@@ -40,9 +106,7 @@ class TestExportToCSV:
         manager, session = mock_session_manager
         
         # Setup mock variables and signal values
-        var1 = Mock()
-        var2 = Mock()
-        session.hierarchy.get_var_by_name = Mock(side_effect=[var1, var2, var1, var2])
+        session.hierarchy.get_var_by_name = {"sig1": SENTINEL_VAR_1, "sig2": SENTINEL_VAR_2}.get
         
         # Mock signal changes - use return_value with iterator
         change1_0 = Mock(time=0, value="0")
@@ -50,7 +114,7 @@ class TestExportToCSV:
         change2_5 = Mock(time=5, value="0xff")
         
         def get_values_side_effect(var):
-            if var == var1:
+            if var is SENTINEL_VAR_1:
                 return iter([change1_0, change1_10])
             else:
                 return iter([change2_5])
@@ -69,23 +133,19 @@ class TestExportToCSV:
         assert result["output_file"] == str(output_file)
         assert result["signals_exported"] == 2
         assert result["rows_written"] > 0
-        assert os.path.exists(output_file)
         
-        # Verify CSV contents
-        with open(output_file, 'r') as f:
-            reader = csv.reader(f)
-            headers = next(reader)
-            assert "Time" in headers[0]
-            assert "sig1" in headers
-            assert "sig2" in headers
+        # Verify CSV header line
+        first_line = output_file.read_text().partition("\n")[0]
+        assert first_line.startswith("Time")
+        assert "sig1" in first_line
+        assert "sig2" in first_line
     
     @pytest.mark.asyncio
     async def test_export_with_time_range(self, mock_session_manager, tmp_path):
         """Test CSV export with time filtering."""
         manager, session = mock_session_manager
         
-        var1 = Mock()
-        session.hierarchy.get_var_by_name = Mock(return_value=var1)
+        session.hierarchy.get_var_by_name = {"sig1": SENTINEL_VAR}.get
         
         change1 = Mock(time=5, value="0")
         change2 = Mock(time=15, value="1")
@@ -111,7 +171,7 @@ class TestExportToCSV:
     async def test_export_invalid_signal(self, mock_session_manager, tmp_path):
         """Test export with invalid signal."""
         manager, session = mock_session_manager
-        session.hierarchy.get_var_by_name = Mock(return_value=None)
+        session.hierarchy.get_var_by_name = {}.get
         
         output_file = tmp_path / "test.csv"
         
@@ -141,18 +201,11 @@ class TestExportHierarchyTree:
     """Tests for export_hierarchy_tree tool."""
     
     @pytest.mark.asyncio
-    async def test_export_json(self, mock_session_manager, tmp_path):
+    async def test_export_json(self, mock_session_manager, base_top_scope, tmp_path):
         """Test hierarchy export as JSON."""
         manager, session = mock_session_manager
         
-        # Setup mock hierarchy
-        top_scope = Mock()
-        top_scope.name = "top"
-        top_scope.scope_type = "Module"
-        top_scope.children = Mock(return_value=[])
-        top_scope.variables = Mock(return_value=[])
-        
-        session.hierarchy.top_scopes = Mock(return_value=[top_scope])
+        session.hierarchy.top_scopes = Mock(return_value=[base_top_scope])
         session.waveform.file_name = Mock(return_value="test.vcd")
         
         output_file = tmp_path / "hierarchy.json"
@@ -167,16 +220,11 @@ class TestExportHierarchyTree:
         assert result["output_file"] == str(output_file)
         assert result["format"] == "json"
         assert result["total_scopes"] >= 1
-        assert os.path.exists(output_file)
         
-        # Verify JSON structure
-        with open(output_file, 'r') as f:
-            data = json.load(f)
-            assert "design" in data
-            assert "scopes" in data
+        assert output_file.read_bytes() == EXPECTED_HIERARCHY_JSON
     
     @pytest.mark.asyncio
-    async def test_export_with_variables(self, mock_session_manager, tmp_path):
+    async def test_export_with_variables(self, mock_session_manager, top_scope_factory, tmp_path):
         """Test hierarchy export including variables."""
         manager, session = mock_session_manager
         
@@ -186,11 +234,7 @@ class TestExportHierarchyTree:
         var1.var_type = "Wire"
         var1.length = Mock(return_value=1)
         
-        top_scope = Mock()
-        top_scope.name = "top"
-        top_scope.scope_type = "Module"
-        top_scope.children = Mock(return_value=[])
-        top_scope.variables = Mock(return_value=[var1])
+        top_scope = top_scope_factory(variables=lambda: [var1])
         
         session.hierarchy.top_scopes = Mock(return_value=[top_scope])
         session.waveform.file_name = Mock(return_value="test.vcd")
@@ -212,17 +256,11 @@ class TestExportHierarchyTree:
             assert "variables" in data["scopes"][0]
     
     @pytest.mark.asyncio
-    async def test_export_text_format(self, mock_session_manager, tmp_path):
+    async def test_export_text_format(self, mock_session_manager, base_top_scope, tmp_path):
         """Test hierarchy export as text tree."""
         manager, session = mock_session_manager
         
-        top_scope = Mock()
-        top_scope.name = "top"
-        top_scope.scope_type = "Module"
-        top_scope.children = Mock(return_value=[])
-        top_scope.variables = Mock(return_value=[])
-        
-        session.hierarchy.top_scopes = Mock(return_value=[top_scope])
+        session.hierarchy.top_scopes = Mock(return_value=[base_top_scope])
         session.waveform.file_name = Mock(return_value="test.vcd")
         
         output_file = tmp_path / "hierarchy.txt"
@@ -235,7 +273,6 @@ class TestExportHierarchyTree:
         )
         
         assert result["format"] == "text"
-        assert os.path.exists(output_file)
         
         # Verify text format
         with open(output_file, 'r') as f:
@@ -265,7 +302,7 @@ class TestLoadSignalList:
             json.dump(config, f)
         
         # Mock hierarchy
-        session.hierarchy.get_var_by_name = Mock(return_value=Mock())
+        session.hierarchy.get_var_by_name = dict.fromkeys(["top.clk", "top.data", "top.valid", "top.ready"], SENTINEL_VAR).get
         
         result = await load_signal_list(
             session_manager=manager,
@@ -314,7 +351,7 @@ class TestSaveSignalList:
     async def test_save_json_config(self, mock_session_manager, tmp_path):
         """Test saving JSON configuration."""
         manager, session = mock_session_manager
-        session.hierarchy.get_var_by_name = Mock(return_value=Mock())
+        session.hierarchy.get_var_by_name = dict.fromkeys(["top.clk", "top.data"], SENTINEL_VAR).get
         
         output_file = tmp_path / "saved_config.json"
         
@@ -330,7 +367,6 @@ class TestSaveSignalList:
         assert result["output_file"] == str(output_file)
         assert result["signals_saved"] == 2
         assert result["groups_saved"] == 1
-        assert os.path.exists(output_file)
         
         # Verify saved content
         with open(output_file, 'r') as f:
@@ -343,7 +379,7 @@ class TestSaveSignalList:
     async def test_save_invalid_signal(self, mock_session_manager, tmp_path):
         """Test saving with invalid signal."""
         manager, session = mock_session_manager
-        session.hierarchy.get_var_by_name = Mock(return_value=None)
+        session.hierarchy.get_var_by_name = {}.get
         
         output_file = tmp_path / "config.json"
         
@@ -364,8 +400,7 @@ class TestExportSignalData:
         """Test exporting signal data as JSON."""
         manager, session = mock_session_manager
         
-        var = Mock()
-        session.hierarchy.get_var_by_name = Mock(return_value=var)
+        session.hierarchy.get_var_by_name = {"top.clk": SENTINEL_VAR}.get
         
         change1 = Mock(time=0, value="0")
         change2 = Mock(time=10, value="1")
@@ -383,21 +418,15 @@ class TestExportSignalData:
         
         assert result["signal_path"] == "top.clk"
         assert result["changes_exported"] == 2
-        assert os.path.exists(output_file)
         
-        with open(output_file, 'r') as f:
-            data = json.load(f)
-            assert "signal" in data
-            assert "changes" in data
-            assert len(data["changes"]) == 2
+        assert output_file.read_bytes() == EXPECTED_SIGNAL_JSON
     
     @pytest.mark.asyncio
     async def test_export_csv(self, mock_session_manager, tmp_path):
         """Test exporting signal data as CSV."""
         manager, session = mock_session_manager
         
-        var = Mock()
-        session.hierarchy.get_var_by_name = Mock(return_value=var)
+        session.hierarchy.get_var_by_name = {"top.clk": SENTINEL_VAR}.get
         
         change1 = Mock(time=0, value="0")
         change2 = Mock(time=10, value="1")
@@ -414,10 +443,6 @@ class TestExportSignalData:
         )
         
         assert result["format"] == "csv"
-        assert os.path.exists(output_file)
         
-        with open(output_file, 'r') as f:
-            reader = csv.reader(f)
-            headers = next(reader)
-            assert "Time" in headers
-            assert "Value" in headers
+        first_line = output_file.read_text().partition("\n")[0]
+        assert first_line.rstrip("\r") == "Time,Value"
@@ -1,23 +1,31 @@
 """Unit tests for hierarchy navigation tools."""
 
+import sys
 import pytest
-from unittest.mock import Mock, patch
+from array import array
+from dataclasses import dataclass
+from unittest.mock import patch
 from pathlib import Path
+from types import SimpleNamespace
 
 from pywellen_mcp.session import SessionManager
-from pywellen_mcp.tools_hierarchy import HierarchyTools
+from pywellen_mcp.tools_hierarchy import HierarchyTools, _compile_pattern
 from pywellen_mcp.errors import SessionError, QueryError, ErrorCode
 
 
+@dataclass(frozen=True, slots=True)
 class MockVar:
-    """Mock variable object."""
+    """Mock variable object; methods mirror the pywellen Var API."""
 
-    def __init__(self, name, full_name, var_type="Wire", bitwidth=1, direction="Unknown"):
-        self._name = name
-        self._full_name = full_name
-        self._var_type = var_type
-        self._bitwidth = bitwidth
-        self._direction = direction
+    _name: str
+    _full_name: str
+    _var_type: str = "Wire"
+    _bitwidth: int = 1
+    _direction: str = "Unknown"
+
+    def __post_init__(self):
+        for field_name in ("_name", "_full_name", "_var_type", "_direction"):
+            object.__setattr__(self, field_name, sys.intern(getattr(self, field_name)))
 
     def name(self, hierarchy):
         return self._name
@@ -57,8 +65,8 @@ class MockScope:
         self._name = name
         self._full_name = full_name
         self._scope_type = scope_type
-        self._vars = vars_list or []
-        self._scopes = scopes_list or []
+        self._vars = tuple(vars_list or ())
+        self._scopes = tuple(scopes_list or ())
 
     def name(self, hierarchy):
         return self._name
@@ -70,103 +78,125 @@ class MockScope:
         return self._scope_type
 
     def vars(self, hierarchy):
-        return iter(self._vars)
+        return self._vars
 
     def scopes(self, hierarchy):
-        return iter(self._scopes)
+        return self._scopes
 
 
 class MockHierarchy:
     """Mock hierarchy object."""
 
     def __init__(self, top_scopes_list=None, all_vars_list=None):
-        self._top_scopes = top_scopes_list or []
-        self._all_vars = all_vars_list or []
+        self._top_scopes = tuple(top_scopes_list or ())
+        self._all_vars = tuple(all_vars_list or ())
+
+        # Structure-of-arrays view of all_vars, in the same order
+        self._soa = SimpleNamespace(
+            full_names=tuple(v._full_name for v in self._all_vars),
+            bitwidths=array("i", (v._bitwidth for v in self._all_vars)),
+            directions=tuple(v._direction for v in self._all_vars),
+            var_types=tuple(v._var_type for v in self._all_vars),
+        )
 
     def top_scopes(self):
-        return iter(self._top_scopes)
+        return self._top_scopes
 
     def all_vars(self):
-        return iter(self._all_vars)
+        return self._all_vars
+
+    def all_vars_soa(self):
+        return self._soa
+
+
+# Shared read-only hierarchy: top -> cpu -> alu
+_ALU_VARS = [
+    MockVar("result", "top.cpu.alu.result", "Wire", 32, "Output"),
+    MockVar("a", "top.cpu.alu.a", "Wire", 32, "Input"),
+    MockVar("b", "top.cpu.alu.b", "Wire", 32, "Input"),
+]
+_ALU_SCOPE = MockScope("alu", "top.cpu.alu", "module", vars_list=_ALU_VARS)
+
+_CPU_VARS = [
+    MockVar("clk", "top.cpu.clk", "Wire", 1, "Input"),
+    MockVar("reset", "top.cpu.reset", "Wire", 1, "Input"),
+]
+_CPU_SCOPE = MockScope("cpu", "top.cpu", "module", vars_list=_CPU_VARS, scopes_list=[_ALU_SCOPE])
+
+_TOP_VARS = [
+    MockVar("clk", "top.clk", "Wire", 1, "Input"),
+]
+_TOP_SCOPE = MockScope("top", "top", "module", vars_list=_TOP_VARS, scopes_list=[_CPU_SCOPE])
+
+
+def _flatten_vars(top_scopes):
+    """Collect all variables depth-first without recursion."""
+    all_vars = []
+    stack = list(reversed(top_scopes))
+    while stack:
+        scope = stack.pop()
+        all_vars.extend(scope._vars)
+        stack.extend(reversed(scope._scopes))
+    return tuple(all_vars)
+
+
+_ALL_VARS = _flatten_vars([_TOP_SCOPE])
+
+_SHARED_HIERARCHY = MockHierarchy(top_scopes_list=[_TOP_SCOPE], all_vars_list=_ALL_VARS)
+_SHARED_TIME_TABLE = SimpleNamespace()
 
 
 class MockWaveform:
     """Mock waveform object."""
 
     def __init__(self, path: str, multi_threaded: bool = True, remove_scopes_with_empty_name: bool = False, **kwargs):
-        # Create a simple hierarchy: top -> cpu -> alu
-        alu_vars = [
-            MockVar("result", "top.cpu.alu.result", "Wire", 32, "Output"),
-            MockVar("a", "top.cpu.alu.a", "Wire", 32, "Input"),
-            MockVar("b", "top.cpu.alu.b", "Wire", 32, "Input"),
-        ]
-        alu_scope = MockScope("alu", "top.cpu.alu", "module", vars_list=alu_vars)
-
-        cpu_vars = [
-            MockVar("clk", "top.cpu.clk", "Wire", 1, "Input"),
-            MockVar("reset", "top.cpu.reset", "Wire", 1, "Input"),
-        ]
-        cpu_scope = MockScope("cpu", "top.cpu", "module", vars_list=cpu_vars, scopes_list=[alu_scope])
-
-        top_vars = [
-            MockVar("clk", "top.clk", "Wire", 1, "Input"),
-        ]
-        top_scope = MockScope("top", "top", "module", vars_list=top_vars, scopes_list=[cpu_scope])
-
-        all_vars = [
-            MockVar("clk", "top.clk", "Wire", 1, "Input"),
-            MockVar("clk", "top.cpu.clk", "Wire", 1, "Input"),
-            MockVar("reset", "top.cpu.reset", "Wire", 1, "Input"),
-            MockVar("result", "top.cpu.alu.result", "Wire", 32, "Output"),
-            MockVar("a", "top.cpu.alu.a", "Wire", 32, "Input"),
-            MockVar("b", "top.cpu.alu.b", "Wire", 32, "Input"),
-        ]
-
-        self.hierarchy = MockHierarchy(top_scopes_list=[top_scope], all_vars_list=all_vars)
-        self.time_table = Mock()
-
-
-@pytest.fixture
-def mock_waveform():
-    """Fixture for mock waveform."""
-    with patch("pywellen_mcp.session.Waveform", MockWaveform):
-        yield MockWaveform
-
-
-@pytest.fixture
+        self.hierarchy = _SHARED_HIERARCHY
+        self.time_table = _SHARED_TIME_TABLE
+
+
+@pytest.fixture(scope="module", autouse=True)
+def mock_waveform(request):
+    """Install the mock Waveform once for every test in this module."""
+    patcher = patch("pywellen_mcp.session.Waveform", MockWaveform)
+    patcher.start()
+    request.addfinalizer(patcher.stop)
+    return MockWaveform
+
+
+@pytest.fixture(scope="module")
 def session_manager():
     """Fixture for SessionManager."""
     return SessionManager(max_sessions=5)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def hierarchy_tools(session_manager):
     """Fixture for HierarchyTools."""
     return HierarchyTools(session_manager)
 
 
-@pytest.fixture
-def temp_file(tmp_path):
-    """Create a temporary test file."""
-    test_file = tmp_path / "test.vcd"
-    test_file.write_text("# dummy vcd content")
-    return test_file
+@pytest.fixture(scope="module")
+def temp_file(shared_vcd):
+    """Dummy waveform file; contents are never read by MockWaveform."""
+    return shared_vcd
+
+
+@pytest.fixture(scope="module")
+def shared_session_id(session_manager, temp_file):
+    """Open one session shared by the read-only tests in this module."""
+    return session_manager.create_session(str(temp_file)).session_id
 
 
 class TestHierarchyListTopScopes:
     """Test hierarchy_list_top_scopes tool."""
 
     @pytest.mark.asyncio
-    async def test_list_top_scopes_success(self, hierarchy_tools, temp_file, mock_waveform, session_manager):
+    async def test_list_top_scopes_success(self, hierarchy_tools, shared_session_id):
         """Test listing top scopes."""
-        # Create session
-        session = session_manager.create_session(str(temp_file))
-        session_id = session.session_id
-
         # List top scopes
-        result = await hierarchy_tools.hierarchy_list_top_scopes(session_id)
+        result = await hierarchy_tools.hierarchy_list_top_scopes(shared_session_id)
 
-        assert result["session_id"] == session_id
+        assert result["session_id"] == shared_session_id
         assert "top_scopes" in result
         assert result["count"] == 1
         assert len(result["top_scopes"]) == 1
@@ -190,12 +220,9 @@ class TestHierarchyGetScope:
     """Test hierarchy_get_scope tool."""
 
     @pytest.mark.asyncio
-    async def test_get_scope_top_level(self, hierarchy_tools, temp_file, mock_waveform, session_manager):
+    async def test_get_scope_top_level(self, hierarchy_tools, shared_session_id):
         """Test getting top-level scope."""
-        session = session_manager.create_session(str(temp_file))
-        session_id = session.session_id
-
-        result = await hierarchy_tools.hierarchy_get_scope(session_id, "top")
+        result = await hierarchy_tools.hierarchy_get_scope(shared_session_id, "top")
 
         assert result["name"] == "top"
         assert result["full_name"] == "top"
@@ -206,12 +233,9 @@ class TestHierarchyGetScope:
         assert len(result["child_scopes"]) == 1
 
     @pytest.mark.asyncio
-    async def test_get_scope_nested(self, hierarchy_tools, temp_file, mock_waveform, session_manager):
+    async def test_get_scope_nested(self, hierarchy_tools, shared_session_id):
         """Test getting nested scope."""
-        session = session_manager.create_session(str(temp_file))
-        session_id = session.session_id
-
-        result = await hierarchy_tools.hierarchy_get_scope(session_id, "top.cpu.alu")
+        result = await hierarchy_tools.hierarchy_get_scope(shared_session_id, "top.cpu.alu")
 
         assert result["name"] == "alu"
         assert result["full_name"] == "top.cpu.alu"
@@ -220,13 +244,10 @@ class TestHierarchyGetScope:
         assert len(result["child_scopes"]) == 0
 
     @pytest.mark.asyncio
-    async def test_get_scope_without_children(self, hierarchy_tools, temp_file, mock_waveform, session_manager):
+    async def test_get_scope_without_children(self, hierarchy_tools, shared_session_id):
         """Test getting scope without including children."""
-        session = session_manager.create_session(str(temp_file))
-        session_id = session.session_id
-
         result = await hierarchy_tools.hierarchy_get_scope(
-            session_id,
+            shared_session_id,
             "top",
             include_variables=False,
             include_child_scopes=False,
@@ -237,13 +258,10 @@ class TestHierarchyGetScope:
         assert "child_scopes" not in result
 
     @pytest.mark.asyncio
-    async def test_get_scope_not_found(self, hierarchy_tools, temp_file, mock_waveform, session_manager):
+    async def test_get_scope_not_found(self, hierarchy_tools, shared_session_id):
         """Test with non-existent scope."""
-        session = session_manager.create_session(str(temp_file))
-        session_id = session.session_id
-
         with pytest.raises(QueryError) as exc_info:
-            await hierarchy_tools.hierarchy_get_scope(session_id, "top.nonexistent")
+            await hierarchy_tools.hierarchy_get_scope(shared_session_id, "top.nonexistent")
         assert exc_info.value.code == ErrorCode.SCOPE_NOT_FOUND
 
 
@@ -251,145 +269,96 @@ class TestHierarchyListVariables:
     """Test hierarchy_list_variables tool."""
 
     @pytest.mark.asyncio
-    async def test_list_all_variables(self, hierarchy_tools, temp_file, mock_waveform, session_manager):
-        """Test listing all variables."""
-        session = session_manager.create_session(str(temp_file))
-        session_id = session.session_id
-
-        result = await hierarchy_tools.hierarchy_list_variables(session_id)
-
-        assert result["session_id"] == session_id
-        assert len(result["variables"]) == 6
-        assert result["pagination"]["total_matched"] == 6
-
-    @pytest.mark.asyncio
-    async def test_list_variables_in_scope(self, hierarchy_tools, temp_file, mock_waveform, session_manager):
-        """Test listing variables in specific scope."""
-        session = session_manager.create_session(str(temp_file))
-        session_id = session.session_id
-
-        result = await hierarchy_tools.hierarchy_list_variables(session_id, scope_path="top.cpu.alu")
-
-        assert len(result["variables"]) == 3
-        assert all(v["full_name"].startswith("top.cpu.alu.") for v in result["variables"])
-
-    @pytest.mark.asyncio
-    async def test_filter_by_bitwidth(self, hierarchy_tools, temp_file, mock_waveform, session_manager):
-        """Test filtering by bitwidth."""
-        session = session_manager.create_session(str(temp_file))
-        session_id = session.session_id
-
-        result = await hierarchy_tools.hierarchy_list_variables(
-            session_id,
-            min_bitwidth=32,
-        )
-
-        assert len(result["variables"]) == 3
-        assert all(v["bitwidth"] == 32 for v in result["variables"])
+    @pytest.mark.parametrize(
+        "kwargs,expected_count,predicate",
+        [
+            pytest.param({}, 6, lambda v: True, id="all"),
+            pytest.param(
+                {"scope_path": "top.cpu.alu"},
+                3,
+                lambda v: v["full_name"].startswith("top.cpu.alu."),
+                id="in_scope",
+            ),
+            pytest.param({"min_bitwidth": 32}, 3, lambda v: v["bitwidth"] == 32, id="by_bitwidth"),
+            # top.clk, top.cpu.clk, top.cpu.reset, top.cpu.alu.a, top.cpu.alu.b
+            pytest.param({"direction": "Input"}, 5, lambda v: v["direction"] == "Input", id="by_direction"),
+        ],
+    )
+    async def test_list_variables_filtered(
+        self, hierarchy_tools, shared_session_id, kwargs, expected_count, predicate
+    ):
+        """Test listing variables with each filter against the shared session."""
+        result = await hierarchy_tools.hierarchy_list_variables(shared_session_id, **kwargs)
+
+        assert result["session_id"] == shared_session_id
+        assert len(result["variables"]) == expected_count
+        assert result["pagination"]["total_matched"] == expected_count
+        assert all(predicate(v) for v in result["variables"])
 
     @pytest.mark.asyncio
-    async def test_filter_by_direction(self, hierarchy_tools, temp_file, mock_waveform, session_manager):
-        """Test filtering by direction."""
-        session = session_manager.create_session(str(temp_file))
-        session_id = session.session_id
-
-        result = await hierarchy_tools.hierarchy_list_variables(
-            session_id,
-            direction="Input",
-        )
-
-        # Should find: top.clk, top.cpu.clk, top.cpu.reset, top.cpu.alu.a, top.cpu.alu.b
-        assert len(result["variables"]) == 5
-        assert all(v["direction"] == "Input" for v in result["variables"])
-
-    @pytest.mark.asyncio
-    async def test_pagination(self, hierarchy_tools, temp_file, mock_waveform, session_manager):
+    async def test_pagination(self, hierarchy_tools, shared_session_id):
         """Test pagination."""
-        session = session_manager.create_session(str(temp_file))
-        session_id = session.session_id
-
-        # Get first 2
-        result1 = await hierarchy_tools.hierarchy_list_variables(session_id, limit=2, offset=0)
-        assert len(result1["variables"]) == 2
-        assert result1["pagination"]["has_more"] is True
-
-        # Get next 2
-        result2 = await hierarchy_tools.hierarchy_list_variables(session_id, limit=2, offset=2)
-        assert len(result2["variables"]) == 2
+        full_names = _SHARED_HIERARCHY.all_vars_soa().full_names
 
-        # Get last 2
-        result3 = await hierarchy_tools.hierarchy_list_variables(session_id, limit=2, offset=4)
-        assert len(result3["variables"]) == 2
-        assert result3["pagination"]["has_more"] is False
+        for offset, has_more in ((0, True), (2, True), (4, False)):
+            result = await hierarchy_tools.hierarchy_list_variables(
+                shared_session_id, limit=2, offset=offset
+            )
+            assert [v["full_name"] for v in result["variables"]] == list(full_names[offset:offset + 2])
+            assert result["pagination"]["has_more"] is has_more
 
 
 class TestHierarchySearch:
     """Test hierarchy_search tool."""
 
     @pytest.mark.asyncio
-    async def test_search_substring(self, hierarchy_tools, temp_file, mock_waveform, session_manager):
+    async def test_search_substring(self, hierarchy_tools, shared_session_id):
         """Test substring search."""
-        session = session_manager.create_session(str(temp_file))
-        session_id = session.session_id
-
-        result = await hierarchy_tools.hierarchy_search(session_id, "clk")
+        result = await hierarchy_tools.hierarchy_search(shared_session_id, "clk")
 
         assert "matching_variables" in result
-        assert len(result["matching_variables"]) == 2
-        assert all("clk" in v["full_name"] for v in result["matching_variables"])
+        assert {v["full_name"] for v in result["matching_variables"]} == {"top.clk", "top.cpu.clk"}
 
     @pytest.mark.asyncio
-    async def test_search_case_sensitive(self, hierarchy_tools, temp_file, mock_waveform, session_manager):
+    async def test_search_case_sensitive(self, hierarchy_tools, shared_session_id):
         """Test case-sensitive search."""
-        session = session_manager.create_session(str(temp_file))
-        session_id = session.session_id
-
         # Case insensitive (default)
-        result1 = await hierarchy_tools.hierarchy_search(session_id, "CLK")
+        result1 = await hierarchy_tools.hierarchy_search(shared_session_id, "CLK")
         assert len(result1["matching_variables"]) == 2
 
         # Case sensitive
-        result2 = await hierarchy_tools.hierarchy_search(session_id, "CLK", case_sensitive=True)
+        result2 = await hierarchy_tools.hierarchy_search(shared_session_id, "CLK", case_sensitive=True)
         assert len(result2["matching_variables"]) == 0
 
     @pytest.mark.asyncio
-    async def test_search_regex(self, hierarchy_tools, temp_file, mock_waveform, session_manager):
+    async def test_search_regex(self, hierarchy_tools, shared_session_id):
         """Test regex search."""
-        session = session_manager.create_session(str(temp_file))
-        session_id = session.session_id
-
         result = await hierarchy_tools.hierarchy_search(
-            session_id,
+            shared_session_id,
             r"top\.cpu\.(clk|reset)",
             regex=True,
         )
 
-        assert len(result["matching_variables"]) == 2
-        names = [v["full_name"] for v in result["matching_variables"]]
-        assert "top.cpu.clk" in names
-        assert "top.cpu.reset" in names
+        assert {v["full_name"] for v in result["matching_variables"]} == {"top.cpu.clk", "top.cpu.reset"}
 
     @pytest.mark.asyncio
-    async def test_search_scopes_only(self, hierarchy_tools, temp_file, mock_waveform, session_manager):
+    async def test_search_scopes_only(self, hierarchy_tools, shared_session_id):
         """Test searching only scopes."""
-        session = session_manager.create_session(str(temp_file))
-        session_id = session.session_id
-
-        result = await hierarchy_tools.hierarchy_search(session_id, "cpu", search_in="scopes")
+        result = await hierarchy_tools.hierarchy_search(shared_session_id, "cpu", search_in="scopes")
 
         assert "matching_scopes" in result
         assert "matching_variables" not in result
         # Should find both "top.cpu" and "top.cpu.alu" (both contain "cpu")
-        assert len(result["matching_scopes"]) == 2
-        scope_names = [s["full_name"] for s in result["matching_scopes"]]
-        assert "top.cpu" in scope_names
+        assert {s["full_name"] for s in result["matching_scopes"]} == {"top.cpu", "top.cpu.alu"}
 
     @pytest.mark.asyncio
-    async def test_search_invalid_regex(self, hierarchy_tools, temp_file, mock_waveform, session_manager):
+    async def test_search_invalid_regex(self, hierarchy_tools, shared_session_id):
         """Test with invalid regex pattern."""
-        session = session_manager.create_session(str(temp_file))
-        session_id = session.session_id
-
         with pytest.raises(QueryError) as exc_info:
-            await hierarchy_tools.hierarchy_search(session_id, "[invalid(", regex=True)
+            await hierarchy_tools.hierarchy_search(shared_session_id, "[invalid(", regex=True)
         assert exc_info.value.code == ErrorCode.INVALID_PARAMETER
+
+    def test_compiled_patterns_are_cached(self):
+        """Test that repeated searches reuse the compiled pattern."""
+        assert _compile_pattern("clk", False, False) is _compile_pattern("clk", False, False)
+        assert _compile_pattern("clk", True, False) is not _compile_pattern("clk", False, False)
@@ -1,84 +1,97 @@
 """Unit tests for integration tools."""
 
+import itertools
 import pytest
-import os
-import tempfile
-import time
-from unittest.mock import Mock, patch, MagicMock
+from dataclasses import dataclass
+from types import SimpleNamespace
+from unittest.mock import mock_open, patch
 from src.pywellen_mcp.tools_integration import (
     integration_launch_viewer,
     integration_watch_file,
     integration_generate_gtkwave_save,
 )
-from src.pywellen_mcp.session import SessionManager
 from src.pywellen_mcp.errors import FileError, ResourceError
 
 
+class FakeHierarchy:
+    """Dict-backed hierarchy that resolves a fixed set of signal names."""
+
+    def __init__(self, names=()):
+        self._map = {name: object() for name in names}
+
+    def get_var_by_name(self, name):
+        return self._map.get(name)
+
+
+@dataclass
+class FakeSession:
+    """Minimal session exposing only a hierarchy."""
+
+    hierarchy: FakeHierarchy
+
+
 @pytest.fixture
 def mock_session_manager():
     """Create a mock session manager."""
-    manager = Mock(spec=SessionManager)
-    session = Mock()
-    session.hierarchy = Mock()
-    manager.get_session = Mock(return_value=session)
+    session = FakeSession(hierarchy=FakeHierarchy())
+    manager = SimpleNamespace(get_session=lambda session_id: session)
     return manager, session
 
 
+@pytest.fixture(scope="class")
+def viewer_mocks():
+    """Patch viewer lookup and process launching once for the whole class."""
+    with patch('src.pywellen_mcp.tools_integration._command_exists', return_value=True) as command_exists, \
+         patch('subprocess.Popen') as popen, \
+         patch('subprocess.run') as run:
+        popen.return_value = SimpleNamespace(pid=12345)
+        run.return_value = SimpleNamespace(returncode=0, stdout="output", stderr="")
+        yield SimpleNamespace(command_exists=command_exists, popen=popen, run=run)
+
+
+@pytest.mark.usefixtures("viewer_mocks")
 class TestIntegrationLaunchViewer:
     """Tests for integration_launch_viewer tool."""
     
     @pytest.mark.asyncio
-    async def test_launch_gtkwave(self, tmp_path):
+    @pytest.mark.parametrize(
+        "use_save_file,wait,expected_status,expected_flag",
+        [
+            pytest.param(False, False, "launched", None, id="background"),
+            # GTKWave should include -a flag for save file
+            pytest.param(True, False, "launched", "-a", id="with_save_file"),
+            pytest.param(False, True, "completed", None, id="wait_mode"),
+        ],
+    )
+    async def test_launch_gtkwave(
+        self, viewer_mocks, shared_vcd, tmp_path, use_save_file, wait, expected_status, expected_flag
+    ):
         """Test launching GTKWave."""
-        # Create temp waveform file
-        waveform = tmp_path / "test.vcd"
-        waveform.write_text("dummy vcd content")
+        save_file = None
+        if use_save_file:
+            save_file = tmp_path / "signals.gtkw"
+            save_file.write_text("dummy save")
         
-        with patch('src.pywellen_mcp.tools_integration._command_exists', return_value=True), \
-             patch('subprocess.Popen') as mock_popen:
-            
-            mock_process = Mock()
-            mock_process.pid = 12345
-            mock_popen.return_value = mock_process
-            
-            result = await integration_launch_viewer(
-                viewer="gtkwave",
-                file_path=str(waveform),
-                wait=False
-            )
-            
-            assert result["viewer"] == "gtkwave"
-            assert result["pid"] == 12345
-            assert result["status"] == "launched"
-            assert "gtkwave" in result["command"]
-    
-    @pytest.mark.asyncio
-    async def test_launch_with_save_file(self, tmp_path):
-        """Test launching viewer with save file."""
-        waveform = tmp_path / "test.vcd"
-        waveform.write_text("dummy vcd")
+        result = await integration_launch_viewer(
+            viewer="gtkwave",
+            file_path=str(shared_vcd),
+            save_file=str(save_file) if save_file else None,
+            wait=wait
+        )
         
-        save_file = tmp_path / "signals.gtkw"
-        save_file.write_text("dummy save")
+        assert result["viewer"] == "gtkwave"
+        assert result["status"] == expected_status
+        assert "gtkwave" in result["command"]
         
-        with patch('src.pywellen_mcp.tools_integration._command_exists', return_value=True), \
-             patch('subprocess.Popen') as mock_popen:
-            
-            mock_process = Mock()
-            mock_process.pid = 12345
-            mock_popen.return_value = mock_process
-            
-            result = await integration_launch_viewer(
-                viewer="gtkwave",
-                file_path=str(waveform),
-                save_file=str(save_file),
-                wait=False
-            )
-            
-            assert result["status"] == "launched"
-            # GTKWave should include -a flag for save file
-            call_args = mock_popen.call_args[0][0]
-            assert "-a" in call_args
+        if wait:
+            assert result["exit_code"] == 0
+            command = viewer_mocks.run.call_args[0][0]
+        else:
+            assert result["pid"] == 12345
+            command = viewer_mocks.popen.call_args[0][0]
+        
+        if expected_flag:
+            assert expected_flag in command
     
     @pytest.mark.asyncio
     async def test_launch_nonexistent_file(self):
@@ -90,53 +103,23 @@ class TestIntegrationLaunchViewer:
             )
     
     @pytest.mark.asyncio
-    async def test_launch_viewer_not_found(self, tmp_path):
+    async def test_launch_viewer_not_found(self, viewer_mocks, shared_vcd, monkeypatch):
         """Test launching when viewer executable not found."""
-        waveform = tmp_path / "test.vcd"
-        waveform.write_text("dummy")
-        
-        with patch('src.pywellen_mcp.tools_integration._command_exists', return_value=False):
-            with pytest.raises(FileError):
-                await integration_launch_viewer(
-                    viewer="gtkwave",
-                    file_path=str(waveform)
-                )
+        monkeypatch.setattr(viewer_mocks.command_exists, "return_value", False)
+        with pytest.raises(FileError):
+            await integration_launch_viewer(
+                viewer="gtkwave",
+                file_path=str(shared_vcd)
+            )
     
     @pytest.mark.asyncio
-    async def test_launch_unknown_viewer(self, tmp_path):
+    async def test_launch_unknown_viewer(self, shared_vcd):
         """Test launching unknown viewer."""
-        waveform = tmp_path / "test.vcd"
-        waveform.write_text("dummy")
-        
         with pytest.raises(ResourceError):
             await integration_launch_viewer(
                 viewer="unknown_viewer",
-                file_path=str(waveform)
-            )
-    
-    @pytest.mark.asyncio
-    async def test_launch_wait_mode(self, tmp_path):
-        """Test launching viewer in wait mode."""
-        waveform = tmp_path / "test.vcd"
-        waveform.write_text("dummy")
-        
-        with patch('src.pywellen_mcp.tools_integration._command_exists', return_value=True), \
-             patch('subprocess.run') as mock_run:
-            
-            mock_result = Mock()
-            mock_result.returncode = 0
-            mock_result.stdout = "output"
-            mock_result.stderr = ""
-            mock_run.return_value = mock_result
-            
-            result = await integration_launch_viewer(
-                viewer="gtkwave",
-                file_path=str(waveform),
-                wait=True
+                file_path=str(shared_vcd)
             )
-            
-            assert result["status"] == "completed"
-            assert result["exit_code"] == 0
 
 
 class TestIntegrationWatchFile:
@@ -155,13 +138,10 @@ class TestIntegrationWatchFile:
         assert result["exists"] == False
     
     @pytest.mark.asyncio
-    async def test_watch_no_changes(self, tmp_path):
+    async def test_watch_no_changes(self, shared_vcd):
         """Test watching file with no changes."""
-        test_file = tmp_path / "test.vcd"
-        test_file.write_text("initial content")
-        
         result = await integration_watch_file(
-            file_path=str(test_file),
+            file_path=str(shared_vcd),
             interval=1,
             max_checks=2
         )
@@ -170,32 +150,36 @@ class TestIntegrationWatchFile:
         assert result["checks_performed"] == 2
     
     @pytest.mark.asyncio
-    async def test_watch_file_modified(self, tmp_path):
-        """Test watching file that gets modified - simplified."""
-        test_file = tmp_path / "test.vcd"
-        test_file.write_text("initial")
-        initial_mtime = os.stat(test_file).st_mtime
-        
-        # Simulate enough time passing and modify file
-        time.sleep(0.1)
-        test_file.write_text("modified content with more text")
-        
-        # Verify file was actually modified
-        new_mtime = os.stat(test_file).st_mtime
-        assert new_mtime > initial_mtime, "File modification time should have changed"
+    async def test_watch_file_modified(self, shared_vcd, monkeypatch):
+        """Test watching file whose modification time advances."""
+        # Every stat reports a later mtime than the one before it
+        mtimes = itertools.count(1.0)
+        monkeypatch.setattr(
+            "src.pywellen_mcp.tools_integration.os.stat",
+            lambda path, *args, **kwargs: SimpleNamespace(st_mtime=next(mtimes), st_size=0),
+        )
         
-        # Now test watching (should detect immediately on first check)
         result = await integration_watch_file(
-            file_path=str(test_file),
+            file_path=str(shared_vcd),
             interval=0,  # Immediate check
             max_checks=1
         )
         
-        # Since we modified it before calling watch, it should detect the change
-        # Actually, watch monitors for changes during monitoring, so this test 
-        # is checking behavior after initial modification
-        assert "status" in result
-        # This test is tricky - skip the exact status check as timing is unreliable
+        assert result["status"] == "modified"
+        assert result["checks_performed"] == 1
+
+
+async def _generate_in_memory(**kwargs):
+    """Run integration_generate_gtkwave_save, capturing the written text instead of touching disk."""
+    mocked = mock_open()
+
+    def written():
+        return "".join(call.args[0] for call in mocked().write.call_args_list)
+
+    with patch("src.pywellen_mcp.tools_integration.open", mocked, create=True), \
+         patch("src.pywellen_mcp.tools_integration.os.path.getsize", lambda path: len(written())):
+        result = await integration_generate_gtkwave_save(**kwargs)
+    return result, written()
 
 
 class TestIntegrationGenerateGTKWaveSave:
@@ -206,14 +190,11 @@ class TestIntegrationGenerateGTKWaveSave:
         """Test generating basic GTKWave save file."""
         manager, session = mock_session_manager
         
-        # Mock signals
-        var1 = Mock()
-        var2 = Mock()
-        session.hierarchy.get_var_by_name = Mock(side_effect=[var1, var2])
+        session.hierarchy = FakeHierarchy(["top.clk", "top.data"])
         
         output_file = tmp_path / "signals.gtkw"
         
-        result = await integration_generate_gtkwave_save(
+        result, content = await _generate_in_memory(
             session_manager=manager,
             session_id="test",
             output_path=str(output_file),
@@ -223,71 +204,56 @@ class TestIntegrationGenerateGTKWaveSave:
         assert result["output_file"] == str(output_file)
         assert result["signals_included"] == 2
         assert result["format"] == "gtkwave_save"
-        assert os.path.exists(output_file)
+        assert result["file_size"] == len(content)
         
         # Verify file content
-        with open(output_file, 'r') as f:
-            content = f.read()
-            assert "GTKWave Save File" in content
-            assert "top.clk" in content
-            assert "top.data" in content
+        assert "GTKWave Save File" in content
+        assert "top.clk" in content
+        assert "top.data" in content
     
     @pytest.mark.asyncio
     async def test_generate_with_groups(self, mock_session_manager, tmp_path):
         """Test generating save file with signal grouping."""
         manager, session = mock_session_manager
         
-        # Mock signals from different scopes
-        var1 = Mock()
-        var2 = Mock()
-        var3 = Mock()
-        session.hierarchy.get_var_by_name = Mock(side_effect=[var1, var2, var3])
-        
-        output_file = tmp_path / "grouped.gtkw"
+        # Signals from different scopes
+        session.hierarchy = FakeHierarchy(["top.cpu.clk", "top.cpu.data", "top.mem.addr"])
         
-        result = await integration_generate_gtkwave_save(
+        result, content = await _generate_in_memory(
             session_manager=manager,
             session_id="test",
-            output_path=str(output_file),
+            output_path=str(tmp_path / "grouped.gtkw"),
             signal_paths=["top.cpu.clk", "top.cpu.data", "top.mem.addr"],
             group_signals=True
         )
         
         assert result["groups_created"] >= 2  # At least top.cpu and top.mem
         
-        with open(output_file, 'r') as f:
-            content = f.read()
-            # Check for group markers
-            assert "@" in content
+        # Check for group markers
+        assert "@" in content
     
     @pytest.mark.asyncio
     async def test_generate_with_time_range(self, mock_session_manager, tmp_path):
         """Test generating save file with time range."""
         manager, session = mock_session_manager
         
-        var1 = Mock()
-        session.hierarchy.get_var_by_name = Mock(return_value=var1)
+        session.hierarchy = FakeHierarchy(["top.clk"])
         
-        output_file = tmp_path / "timed.gtkw"
-        
-        result = await integration_generate_gtkwave_save(
+        result, content = await _generate_in_memory(
             session_manager=manager,
             session_id="test",
-            output_path=str(output_file),
+            output_path=str(tmp_path / "timed.gtkw"),
             signal_paths=["top.clk"],
             time_range={"start": 100, "end": 500}
         )
         
-        with open(output_file, 'r') as f:
-            content = f.read()
-            assert "[timestart]" in content
-            assert "100" in content
+        assert "[timestart]" in content
+        assert "100" in content
     
     @pytest.mark.asyncio
     async def test_generate_no_valid_signals(self, mock_session_manager, tmp_path):
         """Test generating save file with no valid signals."""
         manager, session = mock_session_manager
-        session.hierarchy.get_var_by_name = Mock(return_value=None)
         
         output_file = tmp_path / "empty.gtkw"
         
@@ -2,7 +2,8 @@
 
 import pytest
 import os
-from unittest.mock import Mock, patch
+from datetime import datetime
+from types import SimpleNamespace
 from pywellen_mcp.tools_performance import (
     perf_get_statistics,
     perf_memory_usage,
@@ -12,62 +13,95 @@ from pywellen_mcp.session import SessionManager
 from pywellen_mcp.tools_signal import SignalTools
 
 
-@pytest.fixture
-def mock_hierarchy():
-    """Create mock hierarchy."""
-    top_scope = Mock()
-    top_scope.vars = Mock(return_value=iter([Mock(), Mock(), Mock()]))
-    top_scope.scopes = Mock(return_value=iter([]))
-    
-    child_scope = Mock()
-    child_scope.vars = Mock(return_value=iter([Mock(), Mock()]))
-    child_scope.scopes = Mock(return_value=iter([]))
-    
-    hierarchy = Mock()
-    hierarchy.file_format = Mock(return_value="VCD")
-    hierarchy.top_scopes = Mock(return_value=iter([top_scope, child_scope]))
-    
-    return hierarchy
+_DUMMY = object()
+_PID = os.getpid()
+_WAVEFORM_PATH = "/nonexistent/test.vcd"
+_WAVEFORM_SIZE = 18000
+_FIXED_TIME = datetime(2024, 1, 1, 0, 0, 0)
 
 
-@pytest.fixture
-def session_manager(tmp_path, mock_hierarchy):
-    """Create session manager with mock session."""
-    from datetime import datetime
-    manager = SessionManager(max_sessions=5)
-    
-    # Create a temp file for file size testing
-    test_file = tmp_path / "test.vcd"
-    test_file.write_text("test waveform data" * 1000)
-    
-    session = Mock()
-    session.waveform = Mock()
-    session.hierarchy = mock_hierarchy
-    session.file_path = str(test_file)
-    session.bookmarks = []
-    session.created_at = datetime.now()
-    session.last_accessed = datetime.now()
-    
-    time_table = Mock()
-    def time_table_getitem(self, idx):
+class _TimeTable:
+    """Time table stub holding eleven points, 1000 units apart."""
+
+    def __getitem__(self, idx):
         if idx > 10:
             raise IndexError("Out of range")
         return idx * 1000
-    time_table.__getitem__ = time_table_getitem
-    session.time_table = time_table
+
+
+@pytest.fixture(scope="module")
+def mock_hierarchy():
+    """Create mock hierarchy."""
+    top_scope = SimpleNamespace(
+        vars=lambda hierarchy: (_DUMMY, _DUMMY, _DUMMY),
+        scopes=lambda hierarchy: (),
+    )
+    child_scope = SimpleNamespace(
+        vars=lambda hierarchy: (_DUMMY, _DUMMY),
+        scopes=lambda hierarchy: (),
+    )
+    
+    return SimpleNamespace(
+        file_format=lambda: "VCD",
+        top_scopes=lambda: (top_scope, child_scope),
+    )
+
+
+@pytest.fixture(autouse=True)
+def _stub_waveform_file(monkeypatch):
+    """Report a fixed size for the fake waveform path without touching disk."""
+    exists, getsize = os.path.exists, os.path.getsize
+    monkeypatch.setattr(
+        "pywellen_mcp.tools_performance.os.path.exists",
+        lambda path: path == _WAVEFORM_PATH or exists(path),
+    )
+    monkeypatch.setattr(
+        "pywellen_mcp.tools_performance.os.path.getsize",
+        lambda path: _WAVEFORM_SIZE if path == _WAVEFORM_PATH else getsize(path),
+    )
+
+
+@pytest.fixture(scope="module")
+def _shared_manager(mock_hierarchy):
+    """Session manager and mock session built once for the module."""
+    manager = SessionManager(max_sessions=5)
     
-    manager._sessions["test-session"] = session
+    manager._sessions["test-session"] = SimpleNamespace(
+        waveform=SimpleNamespace(),
+        hierarchy=mock_hierarchy,
+        file_path=_WAVEFORM_PATH,
+        bookmarks=[],
+        created_at=_FIXED_TIME,
+        last_accessed=_FIXED_TIME,
+        time_table=_TimeTable(),
+        update_access_time=lambda: None,
+    )
     
     return manager
 
 
+@pytest.fixture(scope="module")
+def _shared_signal_tools(_shared_manager):
+    """Signal tools instance shared across the module."""
+    return SignalTools(_shared_manager)
+
+
+@pytest.fixture
+def session_manager(_shared_manager):
+    """Shared session manager, restored to the single mock session afterwards."""
+    session = _shared_manager._sessions["test-session"]
+    yield _shared_manager
+    _shared_manager._sessions.clear()
+    _shared_manager._sessions["test-session"] = session
+
+
 @pytest.fixture
-def signal_tools(session_manager):
-    """Create signal tools instance."""
-    return SignalTools(session_manager)
+def signal_tools(session_manager, _shared_signal_tools):
+    """Shared signal tools instance with an empty cache for each test."""
+    yield _shared_signal_tools
+    _shared_signal_tools.signal_cache.clear()
 
 
-@pytest.mark.asyncio
 class TestPerfGetStatistics:
     """Tests for perf_get_statistics tool."""
     
@@ -109,11 +143,10 @@ class TestPerfGetStatistics:
         size_bytes = result["file_info"]["size_bytes"]
         size_mb = result["file_info"]["size_mb"]
         
-        assert size_bytes > 0
+        assert size_bytes == _WAVEFORM_SIZE
         assert size_mb == round(size_bytes / (1024 * 1024), 2)
 
 
-@pytest.mark.asyncio
 class TestPerfMemoryUsage:
     """Tests for perf_memory_usage tool."""
     
@@ -128,7 +161,7 @@ class TestPerfMemoryUsage:
         assert "sessions" in result
         
         # Process stats
-        assert result["process"]["pid"] == os.getpid()
+        assert result["process"]["pid"] == _PID
         assert result["process"]["memory_mb"] > 0
         assert result["process"]["memory_percent"] >= 0
         assert result["process"]["cpu_percent"] >= 0
@@ -151,74 +184,26 @@ class TestPerfMemoryUsage:
         session_info = result["sessions"]["session_list"][0]
         assert "session_id" in session_info
         assert "file_path" in session_info
-        assert "age_seconds" in session_info
-        assert "idle_seconds" in session_info
+        assert session_info["age_seconds"] >= 0
+        assert session_info["idle_seconds"] >= 0
 
 
-@pytest.mark.asyncio
 class TestPerfCacheStats:
     """Tests for perf_cache_stats tool."""
     
-    async def test_get_cache_stats(self, signal_tools):
-        """Test getting cache statistics."""
-        # Add some items to cache
-        signal_tools.signal_cache.put("test-session", "top.clk", Mock())
-        signal_tools.signal_cache.put("test-session", "top.data", Mock())
-        
-        result = await perf_cache_stats(
-            signal_tools,
-            "test-session"
-        )
-        
-        assert "cache_size" in result
-        assert "cache_max" in result
-        assert "utilization" in result
-        assert "cached_signals" in result
-        assert "total_cached" in result
-        
-        assert result["cache_size"] == 2
-        assert result["total_cached"] == 2
-        assert len(result["cached_signals"]) == 2
-    
-    async def test_cache_utilization(self, signal_tools):
-        """Test cache utilization calculation."""
-        # Fill cache partially
-        cache = signal_tools.signal_cache
-        for i in range(10):
-            cache.put("test-session", f"signal_{i}", Mock())
-        
-        result = await perf_cache_stats(
-            signal_tools,
-            "test-session"
-        )
-        
-        expected_utilization = round(10 / cache.max_size, 2)
-        assert result["utilization"] == expected_utilization
-    
-    async def test_empty_cache(self, signal_tools):
-        """Test stats for empty cache."""
-        result = await perf_cache_stats(
-            signal_tools,
-            "test-session"
-        )
-        
-        assert result["cache_size"] == 0
-        assert result["utilization"] == 0.0
-        assert len(result["cached_signals"]) == 0
-    
-    async def test_cache_limit_display(self, signal_tools):
-        """Test that cached signals list is limited."""
-        # Add more than 20 signals
+    @pytest.mark.parametrize("n,displayed", [(0, 0), (2, 2), (10, 10), (30, 20)])
+    async def test_cache_stats(self, signal_tools, n, displayed):
+        """Test cache size, utilization and the limited signal listing."""
         cache = signal_tools.signal_cache
-        for i in range(30):
-            cache.put("test-session", f"signal_{i}", Mock())
+        cache.bulk_put("test-session", {f"signal_{i}": _DUMMY for i in range(n)})
         
         result = await perf_cache_stats(
             signal_tools,
             "test-session"
         )
         
-        # Should limit display to 20
-        assert len(result["cached_signals"]) <= 20
-        # But total should be accurate
-        assert result["total_cached"] == 30
+        assert result["cache_size"] == n
+        assert result["cache_max"] == cache.max_size
+        assert result["total_cached"] == n
+        assert result["utilization"] == round(n / cache.max_size, 2)
+        assert len(result["cached_signals"]) == displayed
@@ -1,9 +1,12 @@
 """Tests for session state persistence tools."""
 
+import asyncio
 import pytest
 import json
+from datetime import datetime
 from pathlib import Path
-from unittest.mock import Mock, AsyncMock
+from unittest.mock import AsyncMock
+from pywellen_mcp import tools_session_state
 from pywellen_mcp.tools_session_state import (
     session_save_state,
     session_load_state,
@@ -11,22 +14,27 @@ from pywellen_mcp.tools_session_state import (
     session_list_bookmarks,
     session_remove_bookmark,
 )
-from pywellen_mcp.session import SessionManager
+from pywellen_mcp.session import SessionManager, WaveformSession
+from pywellen_mcp.errors import FileError, ErrorCode
 
 
 @pytest.fixture
-def session_manager(tmp_path):
-    """Create session manager with mock session."""
+def session_manager(shared_vcd):
+    """Create session manager with a stub session."""
     manager = SessionManager(max_sessions=5)
     
-    test_file = tmp_path / "test.vcd"
-    test_file.write_text("test waveform")
-    
-    session = Mock()
-    session.file_path = str(test_file)
-    session.multi_threaded = True
+    # Real WaveformSession so bookmark state lives on the actual dataclass
+    now = datetime.now()
+    session = WaveformSession(
+        session_id="test-session",
+        filepath=shared_vcd,
+        waveform=None,
+        hierarchy=None,
+        time_table=None,
+        created_at=now,
+        last_accessed=now,
+    )
     session.remove_empty_scopes = False
-    session.bookmarks = []
     
     manager._sessions["test-session"] = session
     
@@ -115,23 +123,130 @@ class TestSessionSaveState:
             state = json.load(f)
         
         assert len(state["bookmarks"]) == 0
+    
+    async def test_save_state_replaces_existing(self, session_manager, tmp_path):
+        """Test saving over an existing checkpoint leaves no temporary file."""
+        save_path = tmp_path / "state.json"
+        save_path.write_text("stale")
+        
+        await session_save_state(
+            session_manager,
+            "test-session",
+            save_path=str(save_path)
+        )
+        
+        with open(save_path, 'r') as f:
+            state = json.load(f)
+        
+        assert state["session_id"] == "test-session"
+        assert [p.name for p in tmp_path.iterdir()] == ["state.json"]
+    
+    async def test_save_state_file_mode(self, session_manager, tmp_path):
+        """Test new checkpoints follow the umask and re-saves keep the existing mode."""
+        new_path = tmp_path / "new.json"
+        shared_path = tmp_path / "shared.json"
+        shared_path.write_text("stale")
+        shared_path.chmod(0o644)
+        
+        await session_save_state(session_manager, "test-session", save_path=str(new_path))
+        await session_save_state(session_manager, "test-session", save_path=str(shared_path))
+        
+        assert new_path.stat().st_mode & 0o777 == 0o666 & ~tools_session_state._UMASK
+        assert shared_path.stat().st_mode & 0o777 == 0o644
+    
+    async def test_concurrent_saves_same_path(self, session_manager, tmp_path):
+        """Test concurrent saves to one path each use their own temp file."""
+        save_path = tmp_path / "state.json"
+        
+        results = await asyncio.gather(*(
+            session_save_state(session_manager, "test-session", save_path=str(save_path))
+            for _ in range(8)
+        ))
+        
+        assert len(results) == 8
+        assert json.loads(save_path.read_text())["session_id"] == "test-session"
+        assert [p.name for p in tmp_path.iterdir()] == ["state.json"]
+    
+    @pytest.mark.parametrize("use_ujson", [
+        pytest.param(True, id="ujson"),
+        pytest.param(False, id="stdlib"),
+    ])
+    async def test_save_state_without_orjson(self, session_manager, tmp_path, monkeypatch, use_ujson):
+        """Test the ujson and stdlib json fallbacks write the same document."""
+        if use_ujson:
+            pytest.importorskip("ujson")
+        monkeypatch.setattr(tools_session_state, "ORJSON_AVAILABLE", False)
+        monkeypatch.setattr(tools_session_state, "UJSON_AVAILABLE", use_ujson)
+        save_path = tmp_path / "state.json"
+        
+        result = await session_save_state(
+            session_manager,
+            "test-session",
+            save_path=str(save_path)
+        )
+        
+        with open(save_path, 'r') as f:
+            state = json.load(f)
+        
+        assert state["session_id"] == "test-session"
+        assert result["state_size_bytes"] == save_path.stat().st_size
+    
+    async def test_save_state_msgpack(self, session_manager, tmp_path):
+        """Test a .msgpack path stores MessagePack."""
+        msgspec = pytest.importorskip("msgspec")
+        save_path = tmp_path / "state.msgpack"
+        
+        await session_save_state(
+            session_manager,
+            "test-session",
+            save_path=str(save_path)
+        )
+        
+        state = msgspec.msgpack.decode(save_path.read_bytes())
+        assert state["session_id"] == "test-session"
+        assert state["config"]["multi_threaded"] is True
 
+    
+    async def test_save_state_zstd(self, session_manager, tmp_path):
+        """Test a .zst path compresses the state and still decodes."""
+        zstandard = pytest.importorskip("zstandard")
+        save_path = tmp_path / "state.json.zst"
+        
+        await session_save_state(
+            session_manager,
+            "test-session",
+            save_path=str(save_path)
+        )
+        
+        data = zstandard.ZstdDecompressor().decompress(save_path.read_bytes())
+        assert json.loads(data)["session_id"] == "test-session"
+    
+    async def test_save_state_zstd_requires_zstandard(self, session_manager, tmp_path, monkeypatch):
+        """Test a .zst path without zstandard reports a file error."""
+        monkeypatch.setattr(tools_session_state, "ZSTD_AVAILABLE", False)
+        
+        with pytest.raises(FileError) as exc:
+            await session_save_state(
+                session_manager,
+                "test-session",
+                save_path=str(tmp_path / "state.json.zst")
+            )
+        
+        assert exc.value.code == ErrorCode.FILE_FORMAT_UNSUPPORTED
+        assert exc.value.to_dict()["error"] == "FILE_FORMAT_UNSUPPORTED"
 
 @pytest.mark.asyncio
 class TestSessionLoadState:
     """Tests for session_load_state tool."""
     
-    async def test_load_state_file_format(self, session_manager, tmp_path):
+    async def test_load_state_file_format(self, session_manager, shared_vcd, tmp_path):
         """Test that load_state reads the correct file format."""
         # Create a state file
-        test_file = tmp_path / "test.vcd"
-        test_file.write_text("test")
-        
         state = {
             "version": "1.0",
             "session_id": "old-session",
             "saved_at": "2024-01-01T00:00:00",
-            "file_path": str(test_file),
+            "file_path": str(shared_vcd),
             "config": {
                 "multi_threaded": True,
                 "remove_empty_scopes": False
@@ -142,16 +257,57 @@ class TestSessionLoadState:
         }
         
         state_file = tmp_path / "state.json"
-        with open(state_file, 'w') as f:
-            json.dump(state, f)
+        state_file.write_bytes(tools_session_state._dumps(state))
         
-        # Read it back to verify format
-        with open(state_file, 'r') as f:
-            loaded = json.load(f)
+        # Read it back through the same decoder session_load_state uses
+        loaded = tools_session_state._decode_state(state_file.read_bytes(), state_file)
         
         assert loaded["version"] == "1.0"
         assert loaded["session_id"] == "old-session"
         assert len(loaded["bookmarks"]) == 1
+    
+    @pytest.mark.parametrize("name,packages", [
+        ("state.json", ()),
+        ("state.msgpack", ("msgspec",)),
+        ("state.json.zst", ("zstandard",)),
+        ("state.msgpack.zst", ("zstandard", "msgspec")),
+    ])
+    async def test_load_state_round_trip(self, session_manager, tmp_path, monkeypatch, name, packages):
+        """Test a saved state loads back with its bookmarks in every format."""
+        for package in packages:
+            pytest.importorskip(package)
+        from pywellen_mcp.tools_waveform import WaveformTools
+        monkeypatch.setattr(
+            WaveformTools,
+            "waveform_open",
+            AsyncMock(return_value={"session_id": "test-session"}),
+        )
+        await session_add_bookmark(session_manager, "test-session", 1000, "Edge")
+        save_path = tmp_path / name
+        await session_save_state(session_manager, "test-session", save_path=str(save_path))
+        session = session_manager.get_session("test-session")
+        session.bookmarks = []
+        session.next_bookmark_id = 0
+        
+        result = await session_load_state(session_manager, str(save_path))
+        
+        assert result["original_session_id"] == "test-session"
+        assert result["bookmarks_restored"] == 1
+        assert session_manager.get_session("test-session").bookmarks[0]["label"] == "Edge"
+        added = await session_add_bookmark(session_manager, "test-session", 2000, "Next")
+        assert added["bookmark_id"] == 1
+    
+    @pytest.mark.parametrize("data", [b"", b'{"version": "1.', b"[1, 2]"])
+    async def test_load_state_rejects_bad_json(self, session_manager, tmp_path, data):
+        """Test empty, truncated or non-mapping JSON reports a file error, not MessagePack."""
+        state_file = tmp_path / "state.json"
+        state_file.write_bytes(data)
+        
+        with pytest.raises(FileError) as exc:
+            await session_load_state(session_manager, str(state_file))
+        
+        assert "MessagePack" not in exc.value.message
+        exc.value.to_dict()
 
 
 @pytest.mark.asyncio
@@ -174,6 +330,17 @@ class TestSessionBookmarks:
         assert result["label"] == "Error occurred"
         assert "created_at" in result
     
+    async def test_add_bookmark_does_no_file_io(self, session_manager, monkeypatch):
+        """Test bookmarks stay in memory until the session state is saved."""
+        def fail_open(*args, **kwargs):
+            raise AssertionError("session_add_bookmark touched the filesystem")
+        monkeypatch.setattr("builtins.open", fail_open)
+        
+        for t in (1000, 2000, 3000):
+            await session_add_bookmark(session_manager, "test-session", t, "Mark")
+        
+        assert len(session_manager.get_session("test-session").bookmarks) == 3
+    
     async def test_list_bookmarks(self, session_manager):
         """Test listing bookmarks."""
         # Add some bookmarks
@@ -216,6 +383,30 @@ class TestSessionBookmarks:
         list_result = await session_list_bookmarks(session_manager, "test-session")
         assert list_result["count"] == 0
     
+    async def test_bookmark_ids_unique_after_remove(self, session_manager):
+        """Test removing an earlier bookmark leaves later ids addressable."""
+        for t in (1000, 2000):
+            await session_add_bookmark(session_manager, "test-session", t, "Mark")
+        await session_remove_bookmark(session_manager, "test-session", 0)
+        
+        result = await session_add_bookmark(session_manager, "test-session", 3000, "Mark")
+        
+        assert result["bookmark_id"] == 2
+        remove_result = await session_remove_bookmark(session_manager, "test-session", 1)
+        assert remove_result["success"]
+        list_result = await session_list_bookmarks(session_manager, "test-session")
+        assert [b["id"] for b in list_result["bookmarks"]] == [2]
+    
+    async def test_bookmark_id_not_reused_after_removing_last(self, session_manager):
+        """Test removing the newest bookmark does not hand its id out again."""
+        for t in (1000, 2000):
+            await session_add_bookmark(session_manager, "test-session", t, "Mark")
+        await session_remove_bookmark(session_manager, "test-session", 1)
+        
+        result = await session_add_bookmark(session_manager, "test-session", 3000, "Mark")
+        
+        assert result["bookmark_id"] == 2
+    
     async def test_remove_nonexistent_bookmark(self, session_manager):
         """Test removing nonexistent bookmark."""
         result = await session_remove_bookmark(
@@ -243,6 +434,21 @@ class TestSessionBookmarks:
         assert len(bookmark["signals"]) == 3
         assert "top.a" in bookmark["signals"]
     
+    async def test_bookmarks_share_repeated_strings(self, session_manager):
+        """Test repeated labels and signal paths are stored once."""
+        for t in (1000, 2000):
+            await session_add_bookmark(
+                session_manager,
+                "test-session",
+                t,
+                "".join(["Re", "try"]),
+                signals=["".join(["top.", "a"])]
+            )
+        
+        first, second = session_manager.get_session("test-session").bookmarks
+        assert first["label"] is second["label"]
+        assert first["signals"][0] is second["signals"][0]
+    
     async def test_empty_bookmark_list(self, session_manager):
         """Test listing when no bookmarks exist."""
         result = await session_list_bookmarks(
@@ -41,6 +41,21 @@ class MockSignal:
         return iter(self._changes)
 
 
+class MockTimeTable:
+    """Mock time table where index * 100 = time."""
+
+    def __init__(self, size: int):
+        self._size = size
+
+    def __getitem__(self, i):
+        if i >= self._size:
+            raise IndexError(f"Index {i} out of range")
+        return i * 100
+
+    def __len__(self):
+        return self._size
+
+
 class MockWaveform:
     """Mock waveform with signals."""
 
@@ -69,13 +84,7 @@ class MockWaveform:
         }
 
         self.hierarchy = Mock()
-        self.time_table = Mock()
-        # Mock time_table: index * 100 = time
-        def mock_getitem(i):
-            if i >= 25:
-                raise IndexError(f"Index {i} out of range")
-            return i * 100
-        self.time_table.__getitem__ = Mock(side_effect=mock_getitem)
+        self.time_table = MockTimeTable(25)
 
     def get_signal_from_path(self, path):
         """Get signal by path."""
@@ -84,31 +93,38 @@ class MockWaveform:
         raise ValueError(f"Signal not found: {path}")
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_waveform():
     """Fixture for mock waveform."""
     with patch("pywellen_mcp.session.Waveform", MockWaveform):
         yield MockWaveform
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def session_manager():
-    """Fixture for SessionManager."""
-    return SessionManager(max_sessions=5)
+    """Fixture for SessionManager shared by every test in this module."""
+    return SessionManager(max_sessions=64)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def signal_tools(session_manager):
     """Fixture for SignalTools."""
     return SignalTools(session_manager, cache_size=10)
 
 
+@pytest.fixture(scope="module")
+def temp_file(shared_vcd):
+    """Dummy waveform file; contents are never read by MockWaveform."""
+    return shared_vcd
+
+
 @pytest.fixture
-def temp_file(tmp_path):
-    """Create a temporary test file."""
-    test_file = tmp_path / "test.vcd"
-    test_file.write_text("# dummy vcd content")
-    return test_file
+def session_id(session_manager, signal_tools, temp_file, mock_waveform):
+    """Open a fresh session on the shared manager and close it afterwards."""
+    session = session_manager.create_session(str(temp_file))
+    yield session.session_id
+    signal_tools.signal_cache.clear_session(session.session_id)
+    session_manager.close_session(session.session_id)
 
 
 class TestSignalCache:
@@ -142,6 +158,32 @@ class TestSignalCache:
         assert cache.get("session1", "signal2") is None
         assert cache.get("session1", "signal3") == signal3
 
+    def test_cache_bulk_put(self):
+        """Test bulk insertion keeps LRU order and capacity."""
+        cache = SignalCache(max_size=3)
+        signal = Mock()
+
+        cache.put("session1", "signal0", signal)
+        cache.bulk_put("session1", {f"signal{i}": signal for i in range(1, 4)})
+
+        assert cache.size() == 3
+        assert cache.get("session1", "signal0") is None
+        assert cache.get("session1", "signal3") == signal
+
+    def test_cache_eviction_across_sessions(self):
+        """Test eviction follows global recency, not per-session order."""
+        cache = SignalCache(max_size=2)
+
+        cache.put("session1", "signal1", Mock())
+        cache.put("session2", "signal1", Mock())
+        cache.put("session2", "signal2", Mock())
+
+        assert cache.get("session1", "signal1") is None
+        assert cache.cached_paths("session1") == []
+        assert cache.cached_paths("session2") == ["signal1", "signal2"]
+        assert cache.clear_session("session2") == 2
+        assert cache.size() == 0
+
     def test_cache_clear_session(self):
         """Test clearing session from cache."""
         cache = SignalCache(max_size=10)
@@ -160,11 +202,8 @@ class TestSignalGetValue:
     """Test signal_get_value tool."""
 
     @pytest.mark.asyncio
-    async def test_get_value_single_time(self, signal_tools, temp_file, mock_waveform, session_manager):
+    async def test_get_value_single_time(self, signal_tools, session_id):
         """Test querying single time."""
-        session = session_manager.create_session(str(temp_file))
-        session_id = session.session_id
-
         result = await signal_tools.signal_get_value(
             session_id,
             "top.clk",
@@ -178,11 +217,8 @@ class TestSignalGetValue:
         assert result["values"][0]["value"] == "1"
 
     @pytest.mark.asyncio
-    async def test_get_value_multiple_times(self, signal_tools, temp_file, mock_waveform, session_manager):
+    async def test_get_value_multiple_times(self, signal_tools, session_id):
         """Test querying multiple times."""
-        session = session_manager.create_session(str(temp_file))
-        session_id = session.session_id
-
         result = await signal_tools.signal_get_value(
             session_id,
             "top.count",
@@ -195,11 +231,20 @@ class TestSignalGetValue:
         assert result["values"][2]["value"] == 2
 
     @pytest.mark.asyncio
-    async def test_get_value_with_format(self, signal_tools, temp_file, mock_waveform, session_manager):
-        """Test value formatting."""
-        session = session_manager.create_session(str(temp_file))
-        session_id = session.session_id
+    async def test_get_value_repeated_times(self, signal_tools, session_id):
+        """Test repeated query times keep their positions in the result."""
+        result = await signal_tools.signal_get_value(
+            session_id,
+            "top.count",
+            times=[1000, 0, 1000],
+        )
+
+        assert [v["time"] for v in result["values"]] == [1000, 0, 1000]
+        assert [v["value"] for v in result["values"]] == [2, 0, 2]
 
+    @pytest.mark.asyncio
+    async def test_get_value_with_format(self, signal_tools, session_id):
+        """Test value formatting."""
         result = await signal_tools.signal_get_value(
             session_id,
             "top.count",
@@ -210,25 +255,33 @@ class TestSignalGetValue:
         assert result["values"][0]["value"] == "0x2"
 
     @pytest.mark.asyncio
-    async def test_get_value_signal_not_found(self, signal_tools, temp_file, mock_waveform, session_manager):
+    async def test_get_value_signal_not_found(self, signal_tools, session_id):
         """Test with non-existent signal."""
-        session = session_manager.create_session(str(temp_file))
-        session_id = session.session_id
-
         with pytest.raises(QueryError) as exc_info:
             await signal_tools.signal_get_value(session_id, "top.nonexistent", times=0)
         assert exc_info.value.code == ErrorCode.SIGNAL_NOT_FOUND
 
 
+    @pytest.mark.asyncio
+    async def test_sessions_are_isolated(self, signal_tools, session_id, session_manager, temp_file):
+        """Test that sessions on the shared manager do not share state."""
+        other_id = session_manager.create_session(str(temp_file)).session_id
+        try:
+            assert other_id != session_id
+
+            await signal_tools.signal_get_value(session_id, "top.clk", times=0)
+            assert signal_tools.signal_cache.get(session_id, "top.clk") is not None
+            assert signal_tools.signal_cache.get(other_id, "top.clk") is None
+        finally:
+            session_manager.close_session(other_id)
+
+
 class TestSignalGetChanges:
     """Test signal_get_changes tool."""
 
     @pytest.mark.asyncio
-    async def test_get_all_changes(self, signal_tools, temp_file, mock_waveform, session_manager):
+    async def test_get_all_changes(self, signal_tools, session_id):
         """Test getting all changes."""
-        session = session_manager.create_session(str(temp_file))
-        session_id = session.session_id
-
         result = await signal_tools.signal_get_changes(
             session_id,
             "top.clk",
@@ -241,11 +294,8 @@ class TestSignalGetChanges:
         assert result["changes"][0]["value"] == "0"
 
     @pytest.mark.asyncio
-    async def test_get_changes_with_time_range(self, signal_tools, temp_file, mock_waveform, session_manager):
+    async def test_get_changes_with_time_range(self, signal_tools, session_id):
         """Test filtering by time range."""
-        session = session_manager.create_session(str(temp_file))
-        session_id = session.session_id
-
         result = await signal_tools.signal_get_changes(
             session_id,
             "top.clk",
@@ -259,11 +309,8 @@ class TestSignalGetChanges:
         assert result["changes"][-1]["time"] == 1500
 
     @pytest.mark.asyncio
-    async def test_get_changes_with_limit(self, signal_tools, temp_file, mock_waveform, session_manager):
+    async def test_get_changes_with_limit(self, signal_tools, session_id):
         """Test limiting number of changes."""
-        session = session_manager.create_session(str(temp_file))
-        session_id = session.session_id
-
         result = await signal_tools.signal_get_changes(
             session_id,
             "top.clk",
@@ -274,11 +321,8 @@ class TestSignalGetChanges:
         assert result["truncated"] is True
 
     @pytest.mark.asyncio
-    async def test_get_changes_invalid_range(self, signal_tools, temp_file, mock_waveform, session_manager):
+    async def test_get_changes_invalid_range(self, signal_tools, session_id):
         """Test with invalid time range."""
-        session = session_manager.create_session(str(temp_file))
-        session_id = session.session_id
-
         with pytest.raises(QueryError) as exc_info:
             await signal_tools.signal_get_changes(
                 session_id,
@@ -293,11 +337,8 @@ class TestTimeGetRange:
     """Test time_get_range tool."""
 
     @pytest.mark.asyncio
-    async def test_get_time_range(self, signal_tools, temp_file, mock_waveform, session_manager):
+    async def test_get_time_range(self, signal_tools, session_id):
         """Test getting time range."""
-        session = session_manager.create_session(str(temp_file))
-        session_id = session.session_id
-
         result = await signal_tools.time_get_range(session_id)
 
         assert result["session_id"] == session_id
@@ -310,11 +351,8 @@ class TestTimeConvert:
     """Test time_convert tool."""
 
     @pytest.mark.asyncio
-    async def test_convert_indices_to_times(self, signal_tools, temp_file, mock_waveform, session_manager):
+    async def test_convert_indices_to_times(self, signal_tools, session_id):
         """Test converting indices to times."""
-        session = session_manager.create_session(str(temp_file))
-        session_id = session.session_id
-
         result = await signal_tools.time_convert(
             session_id,
             indices=[0, 5, 10],
@@ -327,11 +365,8 @@ class TestTimeConvert:
         assert result["index_to_time"][2]["time"] == 1000
 
     @pytest.mark.asyncio
-    async def test_convert_times_to_indices(self, signal_tools, temp_file, mock_waveform, session_manager):
+    async def test_convert_times_to_indices(self, signal_tools, session_id):
         """Test converting times to indices."""
-        session = session_manager.create_session(str(temp_file))
-        session_id = session.session_id
-
         result = await signal_tools.time_convert(
             session_id,
             times=[0, 500, 1000],
@@ -343,11 +378,20 @@ class TestTimeConvert:
         assert result["time_to_index"][0]["exact"] is True
 
     @pytest.mark.asyncio
-    async def test_convert_no_params(self, signal_tools, temp_file, mock_waveform, session_manager):
-        """Test with no conversion parameters."""
-        session = session_manager.create_session(str(temp_file))
-        session_id = session.session_id
+    async def test_convert_times_to_nearest_indices(self, signal_tools, session_id):
+        """Test inexact times map to the nearest point, earlier on ties."""
+        result = await signal_tools.time_convert(
+            session_id,
+            times=[-5, 149, 150, 9999],
+        )
 
+        mapped = [(m["index"], m["nearest_time"]) for m in result["time_to_index"]]
+        assert mapped == [(0, 0), (1, 100), (1, 100), (24, 2400)]
+        assert not any(m["exact"] for m in result["time_to_index"])
+
+    @pytest.mark.asyncio
+    async def test_convert_no_params(self, signal_tools, session_id):
+        """Test with no conversion parameters."""
         with pytest.raises(QueryError) as exc_info:
             await signal_tools.time_convert(session_id)
         assert exc_info.value.code == ErrorCode.INVALID_PARAMETER
@@ -357,11 +401,8 @@ class TestSignalGetStatistics:
     """Test signal_get_statistics tool."""
 
     @pytest.mark.asyncio
-    async def test_get_statistics(self, signal_tools, temp_file, mock_waveform, session_manager):
+    async def test_get_statistics(self, signal_tools, session_id):
         """Test computing statistics."""
-        session = session_manager.create_session(str(temp_file))
-        session_id = session.session_id
-
         result = await signal_tools.signal_get_statistics(
             session_id,
             "top.count",
@@ -376,11 +417,23 @@ class TestSignalGetStatistics:
         assert result["numeric_statistics"]["max_value"] == 4
 
     @pytest.mark.asyncio
-    async def test_get_statistics_with_range(self, signal_tools, temp_file, mock_waveform, session_manager):
-        """Test statistics with time range."""
-        session = session_manager.create_session(str(temp_file))
-        session_id = session.session_id
+    async def test_get_statistics_repeated_values(self, signal_tools, session_id):
+        """Test repeated values count once as unique but every time as samples."""
+        result = await signal_tools.signal_get_statistics(
+            session_id,
+            "top.clk",
+        )
 
+        assert result["num_unique_values"] == 2
+        assert result["numeric_statistics"] == {
+            "min_value": 0,
+            "max_value": 1,
+            "num_numeric_samples": 5,
+        }
+
+    @pytest.mark.asyncio
+    async def test_get_statistics_with_range(self, signal_tools, session_id):
+        """Test statistics with time range."""
         result = await signal_tools.signal_get_statistics(
             session_id,
             "top.count",
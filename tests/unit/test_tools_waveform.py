@@ -37,45 +37,59 @@ class MockHierarchy:
         return iter([Mock()])
 
 
+class MockTimeTable:
+    """Mock time table where index * 100 = time."""
+
+    def __init__(self, size: int):
+        self._size = size
+
+    def __getitem__(self, i):
+        if i >= self._size:
+            raise IndexError(f"Index {i} out of range")
+        return i * 100
+
+    def __len__(self):
+        return self._size
+
+
 class MockWaveform:
     """Mock Waveform object."""
 
     def __init__(self, path: str, multi_threaded: bool = True, remove_scopes_with_empty_name: bool = False, **kwargs):
         self.hierarchy = MockHierarchy()
-        self.time_table = Mock()
-        # Mock time_table indexing - raise IndexError after 10 items to prevent infinite loops
-        def mock_getitem(i):
-            if i >= 10:
-                raise IndexError(f"Index {i} out of range")
-            return i * 100
-        self.time_table.__getitem__ = Mock(side_effect=mock_getitem)
+        self.time_table = MockTimeTable(10)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_waveform():
     """Fixture for mock Waveform."""
     with patch("pywellen_mcp.session.Waveform", MockWaveform):
         yield MockWaveform
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def session_manager():
-    """Fixture for SessionManager."""
+    """Fixture for SessionManager shared by every test in this module."""
     return SessionManager(max_sessions=5)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def waveform_tools(session_manager):
     """Fixture for WaveformTools."""
     return WaveformTools(session_manager)
 
 
-@pytest.fixture
-def temp_file(tmp_path):
-    """Create a temporary test file."""
-    test_file = tmp_path / "test.vcd"
-    test_file.write_text("# dummy vcd content")
-    return test_file
+@pytest.fixture(autouse=True)
+def _reset_sessions(session_manager):
+    """Close every session a test opened on the shared manager."""
+    yield
+    session_manager.cleanup_all()
+
+
+@pytest.fixture(scope="module")
+def temp_file(shared_vcd):
+    """Dummy waveform file; contents are never read by MockWaveform."""
+    return shared_vcd
 
 
 class TestWaveformOpen: